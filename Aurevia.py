@@ -1,32 +1,8 @@
-# seed.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from models.base import Base
-from models.user import UserModel
-from models.listing import ListingModel  
-from config.environment import db_URI
-
-engine = create_engine(db_URI)
-SessionLocal = sessionmaker(bind=engine)
-db = SessionLocal()
-
-print("Recreating database...")
-
-Base.metadata.drop_all(bind=engine)
-Base.metadata.create_all(bind=engine)
-
-print("Seeding data...")
-
-
-admin_user = UserModel(username="admin", email="admin@aurevia.com", role="admin")
-admin_user.set_password("admin123")
-
-
-normal_user = UserModel(username="aliqa", email="ali@aurevia.com", role="user")
-normal_user.set_password("user123")
-
-db.add(admin_user)
-db.add(normal_user)
-db.commit()
-
-print("Database seeded! Admin: admin/admin123")
\ No newline at end of file
+# Aurevia.py
+#
+# Seeding moved to scripts/seed.py, which upserts instead of dropping and
+# recreating the schema (run `alembic upgrade head` first). This is the same
+# as `python -m scripts.seed demo`.
+from scripts.seed import main
+
+main(["demo"])
@@ -0,0 +1,113 @@
+# config/logging_config.py
+#
+# Application logging: records are queued on the request path and written
+# as JSON lines to stdout by a background thread.
+
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from utils.request_context import request_id_var
+from config.environment import log_level, log_levels, log_debug_sample_rate
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id"}
+
+_listener = None
+
+
+class RequestIdFilter(logging.Filter):
+    # Runs on the caller's thread, where the request context is still visible
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+class DebugSamplingFilter(logging.Filter):
+    # Keeps a fraction of DEBUG (and lower) records; higher levels always pass
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or self.rate >= 1 or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Formatted on the caller's thread by JsonQueueHandler
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class JsonQueueHandler(QueueHandler):
+    # The stock prepare() appends the traceback to the message and drops
+    # exc_info, so it never reached the "exc_info" field. Here the message
+    # stays plain and the traceback travels as exc_text.
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+def _parse_levels(spec: str) -> dict:
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging():
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter())
+
+    # Unbounded queue: logging never blocks a request, the listener thread does the I/O
+    log_queue = queue.SimpleQueue()
+    queue_handler = JsonQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(DebugSamplingFilter(log_debug_sample_rate))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(log_level.upper())
+    for name, level in _parse_levels(log_levels).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging():
+    # Flushes whatever is still queued
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
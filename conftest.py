@@ -0,0 +1,7 @@
+# conftest.py
+#
+# Lets the tests import the top-level packages (services, utils, ...) the
+# same way main.py does.
+
+# scripts/load_test.py is a load-test driver, not a pytest module
+collect_ignore = ["scripts"]
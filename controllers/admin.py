@@ -0,0 +1,88 @@
+# controllers/admin.py
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Literal
+from datetime import datetime
+from database import engine, async_engine, get_async_db
+from models.user import UserModel
+from dependencies.require_admin import require_admin
+from services.listing_import import import_listings
+from services.listing_facets import rebuild_facets
+from services.export import stream_export, MEDIA_TYPES, LISTING_EXPORT_COLUMNS, INQUIRY_EXPORT_COLUMNS
+from services.response_cache import response_cache
+from services.events import publish_event
+from utils.pool import pool_stats
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+# Live connection pool statistics for both engines
+@router.get("/pool")
+def get_pool_stats(current_user: UserModel = Depends(require_admin)):
+    return {
+        "sync": pool_stats(engine.pool),
+        "async": pool_stats(async_engine.sync_engine.pool),
+    }
+
+# Bulk listing import. The request body is the raw CSV (with a header row) or
+# NDJSON file, streamed rather than uploaded as multipart form data.
+@router.post("/listings/import")
+async def import_listings_upload(
+    request: Request,
+    format: Optional[Literal["csv", "ndjson"]] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_admin)
+):
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        if "csv" in content_type:
+            format = "csv"
+        elif "ndjson" in content_type or "jsonl" in content_type:
+            format = "ndjson"
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail="Send text/csv or application/x-ndjson, or pass ?format="
+            )
+
+    report = await import_listings(request.stream(), format, db, owner_id=current_user.id)
+    if report.inserted:
+        response_cache.bump()
+        await publish_event("listings", "listing.imported", count=report.inserted)
+    return report.as_dict()
+
+# Recount the facet summary table, e.g. after loading listings outside the API
+@router.post("/listings/facets/rebuild")
+async def rebuild_listing_facets(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_admin)
+):
+    await rebuild_facets(db)
+    await db.commit()
+    response_cache.bump()
+    return {"message": "Facet counts rebuilt"}
+
+def _export_response(columns, name: str, format: str, since: Optional[datetime]):
+    return StreamingResponse(
+        stream_export(columns, format, since),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    )
+
+# Streaming exports for CRM sync; `since` limits to rows created at or after it
+@router.get("/inquiries/export")
+def export_inquiries(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    since: Optional[datetime] = None,
+    current_user: UserModel = Depends(require_admin)
+):
+    return _export_response(INQUIRY_EXPORT_COLUMNS, "inquiries", format, since)
+
+@router.get("/listings/export")
+def export_listings(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    since: Optional[datetime] = None,
+    current_user: UserModel = Depends(require_admin)
+):
+    return _export_response(LISTING_EXPORT_COLUMNS, "listings", format, since)
@@ -0,0 +1,174 @@
+# controllers/auctions.py
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List
+from datetime import timezone
+from database import get_async_db
+from models.auction import AuctionModel, BidModel
+from models.user import UserModel
+from serializers.auction import AuctionCreate, AuctionResponse, BidCreate, BidResponse, HighestBid
+from dependencies.get_current_user import get_current_user
+from dependencies.require_admin import require_admin
+from services.auction_cache import highest_bids
+from services import bidding
+from services.bidding import BidRejected, AuctionNotFound, AUCTION_STATE_COLUMNS
+import logging
+
+router = APIRouter(prefix="/api/auctions", tags=["Auctions"])
+logger = logging.getLogger(__name__)
+
+async def _load_state(auction_id: int, db: AsyncSession):
+    try:
+        return await bidding.load_state(auction_id, db)
+    except AuctionNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Auction not found"
+        )
+
+def _highest_bid(state) -> dict:
+    return {
+        "auction_id": state.auction_id,
+        "current_price": state.current_price,
+        "highest_bidder_id": state.highest_bidder_id,
+        "bid_count": state.bid_count,
+        "minimum_next_bid": state.minimum_next_bid(),
+    }
+
+# Create an auction for a listing (Admin only)
+@router.post("/", response_model=AuctionResponse)
+async def create_auction(
+    auction_data: AuctionCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_admin)
+):
+    # Naive times from the client are taken as UTC
+    starts_at, ends_at = (
+        value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        for value in (auction_data.starts_at, auction_data.ends_at)
+    )
+    if ends_at <= starts_at:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ends_at must be after starts_at"
+        )
+
+    # The listing foreign key stands in for a separate existence check
+    try:
+        result = await db.execute(
+            insert(AuctionModel).values(
+                listing_id=auction_data.listing_id,
+                starting_price=auction_data.starting_price,
+                min_increment=auction_data.min_increment,
+                starts_at=starts_at,
+                ends_at=ends_at,
+                status="active",
+                bid_count=0,
+                version=0
+            ).returning(*AUCTION_STATE_COLUMNS, AuctionModel.listing_id)
+        )
+        auction = result.one()
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Listing not found"
+        )
+
+    highest_bids.store(auction)
+    logger.info("Auction created", extra={"auction_id": auction.id, "listing_id": auction.listing_id})
+    return auction
+
+# List auctions, optionally for one listing
+@router.get("/", response_model=List[AuctionResponse])
+async def get_auctions(
+    listing_id: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = select(AuctionModel)
+    if listing_id is not None:
+        query = query.where(AuctionModel.listing_id == listing_id)
+    result = await db.execute(query.order_by(AuctionModel.ends_at.desc()).limit(limit))
+    return result.scalars().all()
+
+# Get a single auction
+@router.get("/{auction_id}", response_model=AuctionResponse)
+async def get_auction(auction_id: int, db: AsyncSession = Depends(get_async_db)):
+    auction = await db.get(AuctionModel, auction_id)
+    if not auction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Auction not found"
+        )
+    return auction
+
+# Highest bid, served from memory while the cached state is fresh
+@router.get("/{auction_id}/highest", response_model=HighestBid)
+async def get_highest_bid(auction_id: int, db: AsyncSession = Depends(get_async_db)):
+    state = highest_bids.get(auction_id, fresh_only=True) or await _load_state(auction_id, db)
+    return _highest_bid(state)
+
+# Place a bid
+@router.post("/{auction_id}/bids", response_model=BidResponse)
+async def place_bid(
+    auction_id: int,
+    bid_data: BidCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    try:
+        return await bidding.place_bid(db, auction_id, current_user.id, bid_data.amount)
+    except AuctionNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Auction not found"
+        )
+    except BidRejected as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=e.reason)
+
+# Bid history, highest first (Admin only)
+@router.get("/{auction_id}/bids", response_model=List[BidResponse])
+async def get_bids(
+    auction_id: int,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_admin)
+):
+    result = await db.execute(
+        select(BidModel)
+        .where(BidModel.auction_id == auction_id)
+        .order_by(BidModel.amount.desc(), BidModel.id.desc())
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+# Cancel an auction (Admin only)
+@router.post("/{auction_id}/cancel", response_model=AuctionResponse)
+async def cancel_auction(
+    auction_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(require_admin)
+):
+    result = await db.execute(
+        update(AuctionModel)
+        .where(AuctionModel.id == auction_id)
+        .values(status="cancelled", version=AuctionModel.version + 1)
+        .returning(*AUCTION_STATE_COLUMNS, AuctionModel.listing_id)
+        .execution_options(synchronize_session=False)
+    )
+    auction = result.first()
+    if auction is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Auction not found"
+        )
+    await db.commit()
+
+    highest_bids.store(auction)
+    logger.info("Auction cancelled", extra={"auction_id": auction_id})
+    return auction
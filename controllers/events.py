@@ -0,0 +1,88 @@
+# controllers/events.py
+
+import asyncio
+from fastapi import APIRouter, HTTPException, status, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from services.events import event_broker, TOPICS
+
+router = APIRouter(prefix="/api/events", tags=["Events"])
+
+# Comment lines keep idle SSE connections open through proxies
+HEARTBEAT_SECONDS = 15
+
+def _parse_topics(topics: str):
+    requested = [topic for topic in topics.split(",") if topic]
+    unknown = set(requested) - set(TOPICS)
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"topics must be a comma-separated subset of: {', '.join(TOPICS)}"
+        )
+    return requested
+
+# Server-Sent Events stream of listing/inquiry changes
+@router.get("/stream")
+async def stream_events(request: Request, topics: str = Query("listings")):
+    subscription = event_broker.subscribe(_parse_topics(topics))
+
+    async def event_stream():
+        try:
+            while not subscription.overflowed:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"data: {message}\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Same stream over a WebSocket
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket, topics: str = "listings"):
+    try:
+        requested = _parse_topics(topics)
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+
+    await websocket.accept()
+    subscription = event_broker.subscribe(requested)
+
+    async def send():
+        while not subscription.overflowed:
+            try:
+                message = await asyncio.wait_for(subscription.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                continue
+            await websocket.send_text(message)
+        # Too far behind; the client should reconnect and refetch
+        await websocket.close(code=1013)
+
+    async def receive():
+        # Clients send nothing, but only a read notices a closed socket on a quiet topic
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    # Whichever ends first (overflow, send error or disconnect) ends the other
+    tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Not awaited: the handler itself may be being cancelled here, and
+        # the cancelled task has nothing left to report
+        for task in tasks:
+            task.cancel()
+        event_broker.unsubscribe(subscription)
@@ -1,42 +1,120 @@
 # controllers/inquiries.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, insert, update, delete, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import Optional
-from database import get_db
+from datetime import datetime
+from database import get_async_db
 from models.inquiry import InquiryModel
 from models.user import UserModel
-from serializers.inquiry import InquiryCreate, InquiryResponse, InquiryUpdate
+from serializers.inquiry import (
+    InquiryCreate, InquiryResponse, InquiryUpdate, InquiryPage, ListingSummary, UserSummary
+)
+from utils.pagination import encode_cursor, decode_cursor, naive_utc
 from dependencies.get_current_user import get_current_user
+from services.events import publish_event
+from services.inquiry_buffer import inquiry_buffer, InquiryRejected, InquiryBufferUnavailable
+from config.environment import inquiry_write_mode
+import logging
 
 router = APIRouter(prefix="/api/inquiries", tags=["Inquiries"])
+logger = logging.getLogger(__name__)
+
+# Columns returned by the write statements (the InquiryResponse shape)
+INQUIRY_RESPONSE_COLUMNS = [getattr(InquiryModel, name) for name in InquiryResponse.model_fields]
+
+# Owner-or-admin condition, folded into the write's WHERE clause
+def _writable_by(current_user):
+    if current_user.role == "admin":
+        return true()
+    return InquiryModel.user_id == current_user.id
+
+# Called when a guarded write matched nothing: 404 if the row is missing, else 403
+async def _raise_missing_or_forbidden(db: AsyncSession, inquiry_id: int, action: str):
+    exists = await db.scalar(select(InquiryModel.id).where(InquiryModel.id == inquiry_id))
+    if exists is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail="Inquiry not found"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"You can only {action} your own inquiries"
+    )
 
 # Submit an Inquiry 
-@router.post("/", response_model=InquiryResponse)
-def create_inquiry(
+@router.post("/", response_model=InquiryResponse, responses={
+    202: {"description": "Accepted for buffered insert (INQUIRY_WRITE_MODE=buffered)"}
+})
+async def create_inquiry(
     inquiry_data: InquiryCreate, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: Optional[UserModel] = Depends(get_current_user)
 ):
+    if inquiry_write_mode != "direct":
+        return await _submit_to_buffer(inquiry_data, current_user)
+
     # Make sure user_id is set if user is logged in
-    new_inquiry = InquiryModel(
-        listing_id=inquiry_data.listing_id,
-        full_name=inquiry_data.full_name,
-        phone_number=inquiry_data.phone_number,
-        message=inquiry_data.message,
-        user_id=current_user.id if current_user else None
+    result = await db.execute(
+        insert(InquiryModel).values(
+            listing_id=inquiry_data.listing_id,
+            full_name=inquiry_data.full_name,
+            phone_number=inquiry_data.phone_number,
+            message=inquiry_data.message,
+            user_id=current_user.id if current_user else None
+        ).returning(*INQUIRY_RESPONSE_COLUMNS)
     )
-    db.add(new_inquiry)
-    db.commit()
-    db.refresh(new_inquiry)
+    new_inquiry = dict(result.one()._mapping)
+    await db.commit()
+    # No contact details in the event; subscribers only learn that a listing got an inquiry
+    await publish_event("inquiries", "inquiry.created", id=new_inquiry["id"], listing_id=new_inquiry["listing_id"])
     
-    print(f" Created inquiry with user_id: {new_inquiry.user_id}")  # Debug
+    logger.info("Inquiry created", extra={
+        "inquiry_id": new_inquiry["id"],
+        "listing_id": new_inquiry["listing_id"],
+        "user_id": new_inquiry["user_id"],
+    })
     return new_inquiry
 
-# Get All Inquiries Admin Only
-@router.get("/", response_model=list[InquiryResponse])
-def get_all_inquiries(
-    db: Session = Depends(get_db),
+# Batched and buffered modes: the row joins a shared multi-row INSERT (services/inquiry_buffer)
+async def _submit_to_buffer(inquiry_data: InquiryCreate, current_user):
+    values = {**inquiry_data.model_dump(), "user_id": current_user.id if current_user else None}
+
+    if inquiry_write_mode == "buffered":
+        provisional_id = await inquiry_buffer.submit_buffered(values)
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"provisional_id": provisional_id, "status": "queued"}
+        )
+
+    try:
+        inquiry = await inquiry_buffer.submit(values)
+    except InquiryRejected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inquiry could not be saved; check the listing id"
+        )
+    except InquiryBufferUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Inquiries are temporarily unavailable, please retry"
+        )
+    return inquiry
+
+INCLUDE_OPTIONS = {"listing", "user"}
+
+# Get All Inquiries Admin Only (newest first, keyset paginated on (created_at, id))
+@router.get("/", response_model=InquiryPage)
+async def get_all_inquiries(
+    include: Optional[str] = Query(None, description="Comma separated: listing,user"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     # Security Check Only Admin
@@ -45,81 +123,110 @@ def get_all_inquiries(
             status_code=status.HTTP_403_FORBIDDEN, 
             detail="Admin access required"
         )
-    
-    return db.query(InquiryModel).all()
+
+    includes = {part.strip() for part in include.split(",") if part.strip()} if include else set()
+    if not includes <= INCLUDE_OPTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"include must be a subset of: {', '.join(sorted(INCLUDE_OPTIONS))}"
+        )
+
+    query = select(InquiryModel)
+    if since:
+        query = query.where(InquiryModel.created_at >= naive_utc(since))
+    if until:
+        query = query.where(InquiryModel.created_at < naive_utc(until))
+    if cursor:
+        key = tuple_(InquiryModel.created_at, InquiryModel.id)
+        query = query.where(key < decode_cursor(cursor, "created_at"))
+
+    # One extra query per included relationship, however many inquiries are on the page
+    if "listing" in includes:
+        query = query.options(selectinload(InquiryModel.listing))
+    if "user" in includes:
+        query = query.options(selectinload(InquiryModel.user))
+
+    query = query.order_by(InquiryModel.created_at.desc(), InquiryModel.id.desc()).limit(limit + 1)
+    inquiries = (await db.execute(query)).scalars().all()
+
+    next_cursor = None
+    if len(inquiries) > limit:
+        inquiries = inquiries[:limit]
+        next_cursor = encode_cursor(inquiries[-1].created_at, inquiries[-1].id)
+
+    # Relationships that were not eager loaded are never touched (they would lazy load)
+    items = []
+    for inquiry in inquiries:
+        item = InquiryResponse.model_validate(inquiry).model_dump()
+        if "listing" in includes and inquiry.listing is not None:
+            item["listing"] = ListingSummary.model_validate(inquiry.listing)
+        if "user" in includes and inquiry.user is not None:
+            item["user"] = UserSummary.model_validate(inquiry.user)
+        items.append(item)
+
+    return {"items": items, "next_cursor": next_cursor}
 
 #  Get Inquiries for a Specific Listing (Admin sees all, User sees their own)
 @router.get("/listing/{listing_id}", response_model=list[InquiryResponse])
-def get_listing_inquiries(
+async def get_listing_inquiries(
     listing_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     # Admin can see all inquiries for this listing
     if current_user.role == "admin":
-        inquiries = db.query(InquiryModel).filter(
+        query = select(InquiryModel).where(
             InquiryModel.listing_id == listing_id
-        ).order_by(InquiryModel.created_at.desc()).all()
+        ).order_by(InquiryModel.created_at.desc())
     else:
         # Regular users can only see their own inquiries for this listing
-        inquiries = db.query(InquiryModel).filter(
+        query = select(InquiryModel).where(
             InquiryModel.listing_id == listing_id,
             InquiryModel.user_id == current_user.id
-        ).order_by(InquiryModel.created_at.desc()).all()
+        ).order_by(InquiryModel.created_at.desc())
     
-    return inquiries
+    result = await db.execute(query)
+    return result.scalars().all()
 
 #  Update an Inquiry (User who created it or Admin)
 @router.put("/{inquiry_id}", response_model=InquiryResponse)
-def update_inquiry(
+async def update_inquiry(
     inquiry_id: int,
     inquiry_data: InquiryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    inquiry = db.query(InquiryModel).filter(InquiryModel.id == inquiry_id).first()
-    if not inquiry:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, 
-            detail="Inquiry not found"
-        )
-    
-    # Check if user is the owner or admin
-    if inquiry.user_id != current_user.id and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only update your own inquiries"
-        )
-    
-    # Update fields
-    for key, value in inquiry_data.dict(exclude_unset=True).items():
-        setattr(inquiry, key, value)
+    changes = inquiry_data.model_dump(exclude_unset=True)
+    query = select(*INQUIRY_RESPONSE_COLUMNS) if not changes else (
+        update(InquiryModel).values(**changes).returning(*INQUIRY_RESPONSE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    # One statement checks existence, ownership and writes
+    result = await db.execute(
+        query.where(InquiryModel.id == inquiry_id, _writable_by(current_user))
+    )
+    row = result.first()
+    if row is None:
+        await _raise_missing_or_forbidden(db, inquiry_id, "update")
     
-    db.commit()
-    db.refresh(inquiry)
-    return inquiry
+    await db.commit()
+    return dict(row._mapping)
 
 # Delete an Inquiry (User who created it or Admin)
 @router.delete("/{inquiry_id}")
-def delete_inquiry(
+async def delete_inquiry(
     inquiry_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    inquiry = db.query(InquiryModel).filter(InquiryModel.id == inquiry_id).first()
-    if not inquiry:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, 
-            detail="Inquiry not found"
-        )
+    result = await db.execute(
+        delete(InquiryModel)
+        .where(InquiryModel.id == inquiry_id, _writable_by(current_user))
+        .returning(InquiryModel.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.first() is None:
+        await _raise_missing_or_forbidden(db, inquiry_id, "delete")
     
-    # Check if user is the owner or admin
-    if inquiry.user_id != current_user.id and current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only delete your own inquiries"
-        )
-        
-    db.delete(inquiry)
-    db.commit()
-    return {"message": "Inquiry deleted successfully"}
\ No newline at end of file
+    await db.commit()
+    return {"message": "Inquiry deleted successfully"}
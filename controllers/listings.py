@@ -1,16 +1,28 @@
 # controllers/listings.py
 
-from fastapi import APIRouter, Depends, HTTPException, status, Form
-from sqlalchemy.orm import Session
-from typing import Optional, List
-from database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Form, Query, Request
+from sqlalchemy import select, insert, update, delete, tuple_, func, Float, String, case, cast
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List, Literal
+from database import get_async_db, AsyncSessionLocal
 from models.listing import ListingModel
 from models.user import UserModel
 from dependencies.get_current_user import get_current_user
+from utils.pagination import SORT_OPTIONS, encode_cursor, decode_cursor
+from services.response_cache import response_cache, cached_json_response, make_etag
+from services.search_index import listing_search_index, tokenize, use_postgres_search
+from services.events import publish_event
+from services.image_pipeline import image_pipeline
+from services.listing_facets import facet_counts, facet_values, adjust_facets, FACET_COLUMNS
+from serializers.listing import ImageVariants, ListingUpdate as ListingPatch
 from pydantic import BaseModel
 import json
+import logging
+import orjson
 
 router = APIRouter(prefix="/api/listings", tags=["Listings"])
+logger = logging.getLogger(__name__)
 
 # Pydantic models
 class ListingUpdate(BaseModel):
@@ -36,85 +48,251 @@ class ListingResponse(BaseModel):
     price: float
     status: str
     images: List[str]
+    # Empty until the variants are built; clients fall back to images
+    image_variants: List[ImageVariants] = []
     notes: Optional[str] = None
     
     class Config:
         from_attributes = True
 
-# Get all listings
-@router.get("/", response_model=List[ListingResponse])
-def get_all_listings(db: Session = Depends(get_db)):
-    listings = db.query(ListingModel).all()
-    
-    # Ensure images is always a list
-    for listing in listings:
-        if isinstance(listing.images, str):
-            try:
-                listing.images = json.loads(listing.images)
-            except:
-                listing.images = []
-        elif not isinstance(listing.images, list):
-            listing.images = []
-    
-    return listings
+class ListingPage(BaseModel):
+    items: List[ListingResponse]
+    next_cursor: Optional[str] = None
+
+# Fields a client may pick with ?fields= (the list endpoint's response shape)
+LISTING_FIELDS = list(ListingResponse.model_fields)
+
+def listing_fields(fields: Optional[str] = None):
+    if not fields:
+        return LISTING_FIELDS
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in LISTING_FIELDS]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested"
+        )
+    # Keep the response's field order and drop duplicates
+    return [name for name in LISTING_FIELDS if name in requested]
+
+# Query-string filters shared by the listing read endpoints
+def listing_filters(
+    status: Optional[str] = None,
+    make: Optional[str] = None,
+    spec: Optional[str] = None,
+    min_year: Optional[int] = None,
+    max_year: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+):
+    return {
+        "status": status,
+        "make": make,
+        "spec": spec,
+        "min_year": min_year,
+        "max_year": max_year,
+        "min_price": min_price,
+        "max_price": max_price,
+    }
+
+def apply_listing_filters(query, filters: dict):
+    if filters["status"]:
+        query = query.filter(ListingModel.status == filters["status"])
+    if filters["make"]:
+        query = query.filter(ListingModel.make == filters["make"])
+    if filters["spec"]:
+        query = query.filter(ListingModel.spec == filters["spec"])
+    if filters["min_year"] is not None:
+        query = query.filter(ListingModel.model_year >= filters["min_year"])
+    if filters["max_year"] is not None:
+        query = query.filter(ListingModel.model_year <= filters["max_year"])
+    if filters["min_price"] is not None:
+        query = query.filter(ListingModel.price >= filters["min_price"])
+    if filters["max_price"] is not None:
+        query = query.filter(ListingModel.price <= filters["max_price"])
+    return query
+
+# Get a page of listings (keyset pagination on (sort column, id))
+@router.get("/", response_model=ListingPage)
+async def get_all_listings(
+    request: Request,
+    sort: Literal["created_at", "-created_at", "price", "-price"] = "-created_at",
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    filters: dict = Depends(listing_filters),
+    fields: List[str] = Depends(listing_fields),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Served from the response cache until a listing write bumps its version
+    async def build():
+        return await listing_page_json(db, sort, limit, cursor, filters, fields)
+
+    return await cached_json_response(request, build)
+
+# Selects only the needed columns as plain rows (no ORM objects, no pydantic
+# pass) and encodes the page straight to bytes with orjson
+async def listing_page_json(db, sort, limit, cursor, filters, fields) -> bytes:
+    column_name, descending = SORT_OPTIONS[sort]
+    sort_column = getattr(ListingModel, column_name)
+
+    # The cursor needs the sort value and id even when they were not requested
+    selected = fields + [name for name in ("id", column_name) if name not in fields]
+    query = apply_listing_filters(select(*[getattr(ListingModel, name) for name in selected]), filters)
+
+    # Continue strictly after the last row of the previous page
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, column_name)
+        key = tuple_(sort_column, ListingModel.id)
+        query = query.filter(key < (last_value, last_id) if descending else key > (last_value, last_id))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), ListingModel.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), ListingModel.id.asc())
+
+    # Fetch one extra row to know whether there is a next page
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]._mapping
+        next_cursor = encode_cursor(last[column_name], last["id"])
+
+    width = len(fields)
+    return orjson.dumps({
+        "items": [dict(zip(fields, row[:width])) for row in rows],
+        "next_cursor": next_cursor,
+    })
+
+# Full-text search, ranked best first, combinable with the listing filters
+@router.get("/search", response_model=ListingPage)
+async def search_listings(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    match: Literal["any", "all"] = "any",
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    filters: dict = Depends(listing_filters),
+    db: AsyncSession = Depends(get_async_db)
+):
+    terms = tokenize(q)[:20]
+    after = decode_cursor(cursor, "rank") if cursor else None
+
+    async def build():
+        if not terms:
+            rows, next_cursor = [], None
+        elif await use_postgres_search(db):
+            rows, next_cursor = await _search_postgres(db, terms, match == "all", filters, limit, after)
+        else:
+            rows, next_cursor = await _search_python(db, terms, match == "all", filters, limit, after)
+
+        page = ListingPage.model_validate({"items": rows, "next_cursor": next_cursor}, from_attributes=True)
+        return page.model_dump_json().encode()
+
+    return await cached_json_response(request, build)
+
+async def _search_postgres(db, terms, match_all, filters, limit, after):
+    # Terms are already reduced to [a-z0-9]+, so they are safe to join into a tsquery
+    tsquery = func.to_tsquery("english", (" & " if match_all else " | ").join(terms))
+    rank = func.ts_rank_cd(ListingModel.search_vector, tsquery, type_=Float)
+
+    query = apply_listing_filters(
+        select(ListingModel, rank.label("rank")).where(ListingModel.search_vector.op("@@")(tsquery)),
+        filters
+    )
+    if after:
+        query = query.where(tuple_(rank, ListingModel.id) < after)
+    query = query.order_by(rank.desc(), ListingModel.id.desc()).limit(limit + 1)
+
+    rows = (await db.execute(query)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].rank, rows[-1].ListingModel.id)
+    return [row.ListingModel for row in rows], next_cursor
+
+async def _search_python(db, terms, match_all, filters, limit, after):
+    index = await listing_search_index.get(db)
+    results = index.search(terms, match_all, filters)
+    if after:
+        results = [item for item in results if (item[0], item[1]["id"]) < after]
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = encode_cursor(results[-1][0], results[-1][1]["id"])
+    return [row for _, row in results], next_cursor
+
+# Counts per make, spec, status, model_year and price bucket for the filter sidebar
+@router.get("/facets")
+async def get_listing_facets(
+    request: Request,
+    filters: dict = Depends(listing_filters),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Unfiltered requests read the summary table; filters aggregate the matching listings
+    async def build():
+        filtered = None
+        if any(value is not None for value in filters.values()):
+            filtered = apply_listing_filters(select(*FACET_COLUMNS), filters)
+        return orjson.dumps(await facet_counts(db, filtered))
+
+    return await cached_json_response(request, build)
 
 # Get single listing by ID
 @router.get("/{listing_id}", response_model=ListingResponse)
-def get_listing(listing_id: int, db: Session = Depends(get_db)):
-    listing = db.query(ListingModel).filter(ListingModel.id == listing_id).first()
-    
-    if not listing:
+async def get_listing(request: Request, listing_id: int, db: AsyncSession = Depends(get_async_db)):
+    async def build():
+        listing = await db.get(ListingModel, listing_id)
+
+        if not listing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Listing not found"
+            )
+
+        return ListingResponse.model_validate(listing).model_dump_json().encode()
+
+    return await cached_json_response(request, build)
+
+# Startup warm-up: fills the response cache with the unfiltered first page and
+# facet counts (the keys a request without a query string looks up) and builds
+# the in-memory search index when that is the search backend
+async def prime_listing_caches():
+    async with AsyncSessionLocal() as db:
+        async def first_page():
+            return await listing_page_json(db, "-created_at", 20, None, listing_filters(), LISTING_FIELDS)
+
+        async def all_facets():
+            return orjson.dumps(await facet_counts(db))
+
+        version = response_cache.version
+        for path, build in (("/api/listings/", first_page), ("/api/listings/facets", all_facets)):
+            body = await build()
+            response_cache.set((path, ()), version, make_etag(body), body)
+        if not await use_postgres_search(db):
+            await listing_search_index.get(db)
+
+# Columns returned by the write statements (the ListingResponse shape)
+LISTING_RESPONSE_COLUMNS = [getattr(ListingModel, name) for name in LISTING_FIELDS]
+# Previous values an update needs for facet counts and image variants
+PREVIOUS_COLUMNS = ("make", "spec", "status", "model_year", "price", "images")
+# Columns a PATCH may not set to null
+REQUIRED_COLUMNS = {"make", "model_year", "spec", "exterior", "interior", "price", "images"}
+
+def _require_admin_for(action: str, current_user):
+    # Checked before any query, so a denied write costs no round trip
+    if current_user.role != "admin":
+        logger.warning(f"Listing {action} denied", extra={"user_id": current_user.id})
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Listing not found"
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Only admins can {action} listings"
         )
-    
-    print(f"\n🔍 GET Listing {listing_id}")
-    print(f"📸 Images from DB (raw): {listing.images}")
-    print(f"📸 Images type: {type(listing.images)}")
-    
-    # Fix the images field
-    if listing.images:
-        if isinstance(listing.images, str):
-            print(f"⚠️ Images is string, parsing...")
-            try:
-                parsed = json.loads(listing.images)
-                # Check if it resulted in a string again
-                if isinstance(parsed, str):
-                    # Split by comma
-                    listing.images = [url.strip() for url in parsed.split(',') if url.strip()]
-                else:
-                    listing.images = parsed
-                print(f"✅ Parsed to: {listing.images}")
-            except Exception as e:
-                print(f"❌ Parse failed: {e}")
-                listing.images = []
-        elif isinstance(listing.images, list):
-            # Check if it's a list of single characters (the bug!)
-            if len(listing.images) > 10 and all(isinstance(item, str) and len(item) == 1 for item in listing.images):
-                print(f"🔧 Fixing character list...")
-                joined = ''.join(listing.images)
-                # Remove curly braces
-                joined = joined.strip('{}')
-                # Split by comma
-                listing.images = [url.strip() for url in joined.split(',') if url.strip()]
-                print(f" Fixed to: {listing.images}")
-            else:
-                # Filter to keep only valid URLs
-                listing.images = [img for img in listing.images if isinstance(img, str) and img.startswith('http')]
-        else:
-            listing.images = []
-    else:
-        listing.images = []
-    
-    print(f" Returning images: {listing.images}")
-    print(f"Count: {len(listing.images)}\n")
-    
-    return listing
 
 # Create new listing (FormData)
 @router.post("/", response_model=ListingResponse)
-def create_listing(
+async def create_listing(
     make: str = Form(...),
     model_year: int = Form(...),
     mileage: int = Form(0),
@@ -122,146 +300,168 @@ def create_listing(
     exterior: str = Form(...),
     interior: str = Form(...),
     price: float = Form(...),
-    status: str = Form(...),
+    listing_status: str = Form(..., alias="status"),
     images: str = Form(...),  # JSON string
     notes: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     # Parse images JSON string
     try:
         image_list = json.loads(images)
-    except json.JSONDecodeError:
+        # Only a JSON array of URL strings is stored, so reads never need repairing
+        if not isinstance(image_list, list) or not all(isinstance(url, str) for url in image_list):
+            raise ValueError("images must be a JSON array of strings")
+    except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid images format"
         )
     
-    # Check if user is admin
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can create listings"
-        )
+    _require_admin_for("create", current_user)
     
-    new_listing = ListingModel(
-        make=make,
-        model_year=model_year,
-        mileage=mileage,
-        spec=spec,
-        exterior=exterior,
-        interior=interior,
-        price=price,
-        status=status,
-        images=image_list,
-        notes=notes
+    # INSERT ... RETURNING gives back the row, so no refresh is needed
+    result = await db.execute(
+        insert(ListingModel).values(
+            make=make,
+            model_year=model_year,
+            mileage=mileage,
+            spec=spec,
+            exterior=exterior,
+            interior=interior,
+            price=price,
+            status=listing_status,
+            images=image_list,
+            notes=notes
+        ).returning(*LISTING_RESPONSE_COLUMNS)
     )
+    new_listing = dict(result.one()._mapping)
+    await adjust_facets(db, added=[facet_values(new_listing)])
+    await db.commit()
+    response_cache.bump()
+    image_pipeline.enqueue(new_listing["id"], new_listing["images"])
+    await publish_event("listings", "listing.created", id=new_listing["id"], status=new_listing["status"])
     
-    db.add(new_listing)
-    db.commit()
-    db.refresh(new_listing)
-    
-    print(f"✅ Created new listing {new_listing.id}")
+    logger.info("Listing created", extra={"listing_id": new_listing["id"], "user_id": current_user.id})
     return new_listing
 
-# Update listing (JSON)
+# Applies `changes` with one UPDATE ... FROM (locked previous row) ... RETURNING,
+# which yields both the new row and the values it replaced
+async def _update_listing_columns(db: AsyncSession, listing_id: int, changes: dict, current_user) -> dict:
+    previous = (
+        select(ListingModel.id, *[getattr(ListingModel, name) for name in PREVIOUS_COLUMNS])
+        .where(ListingModel.id == listing_id)
+        .with_for_update()
+        .subquery("previous")
+    )
+    if "images" in changes:
+        # Old variants no longer line up when the images change; rebuilt in the background
+        changes["image_variants"] = case(
+            (previous.c.images == cast(changes["images"], ARRAY(String)), ListingModel.image_variants),
+            else_=cast("[]", JSONB)
+        )
+
+    try:
+        result = await db.execute(
+            update(ListingModel)
+            .where(ListingModel.id == previous.c.id)
+            .values(**changes)
+            .returning(*LISTING_RESPONSE_COLUMNS,
+                       *[previous.c[name].label(f"previous_{name}") for name in PREVIOUS_COLUMNS])
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Listing not found"
+            )
+        listing = {name: row._mapping[name] for name in LISTING_FIELDS}
+        before = {name: row._mapping[f"previous_{name}"] for name in PREVIOUS_COLUMNS}
+        await adjust_facets(db, added=[facet_values(listing)], removed=[facet_values(before)])
+        await db.commit()
+    except HTTPException:
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.exception("Listing update failed", extra={"listing_id": listing_id})
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(e)}"
+        )
+
+    response_cache.bump()
+    logger.info("Listing updated", extra={"listing_id": listing_id, "user_id": current_user.id, "fields": sorted(changes)})
+    if before["images"] != listing["images"]:
+        image_pipeline.enqueue(listing["id"], listing["images"])
+    await publish_event("listings", "listing.updated", id=listing["id"], status=listing["status"])
+    return listing
+
+# Update listing (JSON, every field)
 @router.put("/{listing_id}", response_model=ListingResponse)
-def update_listing(
+async def update_listing(
     listing_id: int,
     listing_data: ListingUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    print(f"\n{'='*50}")
-    print(f"🔄 UPDATE REQUEST for listing {listing_id}")
-    print(f"{'='*50}")
-    print(f"👤 User: {current_user.id} | Role: {current_user.role}")
-    print(f"📦 Data received:")
-    print(f"   - Make: {listing_data.make}")
-    print(f"   - Year: {listing_data.model_year}")
-    print(f"   - Price: {listing_data.price}")
-    print(f"   - Status: {listing_data.status}")
-    print(f"📸 Images:")
-    print(f"   - Type: {type(listing_data.images)}")
-    print(f"   - Is List: {isinstance(listing_data.images, list)}")
-    print(f"   - Count: {len(listing_data.images)}")
-    if listing_data.images:
-        for i, img in enumerate(listing_data.images):
-            print(f"   - Image {i+1}: {img[:80]}..." if len(img) > 80 else f"   - Image {i+1}: {img}")
-    print(f"{'='*50}\n")
-    
-    # Find the listing
-    listing = db.query(ListingModel).filter(ListingModel.id == listing_id).first()
-    
-    if not listing:
-        print(f"❌ Listing {listing_id} not found")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Listing not found"
-        )
-    
-    # Only admins can update listings
-    if current_user.role != "admin":
-        print(f"🚫 Authorization failed - user is not admin")
+    logger.debug("Update requested", extra={
+        "listing_id": listing_id,
+        "user_id": current_user.id,
+        "image_count": len(listing_data.images),
+    })
+    _require_admin_for("update", current_user)
+    return await _update_listing_columns(db, listing_id, listing_data.model_dump(), current_user)
+
+# Partially update listing (JSON, only the fields sent are written)
+@router.patch("/{listing_id}", response_model=ListingResponse)
+async def patch_listing(
+    listing_id: int,
+    listing_data: ListingPatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    _require_admin_for("update", current_user)
+    changes = listing_data.model_dump(exclude_unset=True)
+    if not changes:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can update listings"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
         )
-    
-    # Update all fields
-    print(f"📝 Updating listing fields...")
-    listing.make = listing_data.make
-    listing.model_year = listing_data.model_year
-    listing.mileage = listing_data.mileage
-    listing.spec = listing_data.spec
-    listing.exterior = listing_data.exterior
-    listing.interior = listing_data.interior
-    listing.price = listing_data.price
-    listing.status = listing_data.status
-    listing.images = listing_data.images
-    listing.notes = listing_data.notes
-    
-    # Commit to database
-    try:
-        db.commit()
-        db.refresh(listing)
-        print(f"✅ Listing {listing_id} updated successfully!")
-        print(f"✅ Updated images count: {len(listing.images)}")
-        print(f"{'='*50}\n")
-    except Exception as e:
-        db.rollback()
-        print(f"❌ Database error: {str(e)}")
+    cleared = sorted(name for name, value in changes.items() if value is None and name in REQUIRED_COLUMNS)
+    if cleared:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Database error: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Fields cannot be null: {', '.join(cleared)}"
         )
-    
-    return listing
+    return await _update_listing_columns(db, listing_id, changes, current_user)
 
 # Delete listing
 @router.delete("/{listing_id}")
-def delete_listing(
+async def delete_listing(
     listing_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    listing = db.query(ListingModel).filter(ListingModel.id == listing_id).first()
+    _require_admin_for("delete", current_user)
     
-    if not listing:
+    result = await db.execute(
+        delete(ListingModel)
+        .where(ListingModel.id == listing_id)
+        .returning(*[getattr(ListingModel, name) for name in PREVIOUS_COLUMNS])
+        .execution_options(synchronize_session=False)
+    )
+    row = result.first()
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Listing not found"
         )
     
-    # Only admins can delete listings
-    if current_user.role != "admin":
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can delete listings"
-        )
-    
-    db.delete(listing)
-    db.commit()
+    await adjust_facets(db, removed=[facet_values(dict(row._mapping))])
+    await db.commit()
+    response_cache.bump()
+    await publish_event("listings", "listing.deleted", id=listing_id)
     
-    print(f"🗑️ Listing {listing_id} deleted successfully")
+    logger.info("Listing deleted", extra={"listing_id": listing_id, "user_id": current_user.id})
     return {"message": "Listing deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,26 @@
+# controllers/metrics.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from database import engine, async_engine
+from services.request_metrics import request_metrics
+from services.events import event_broker
+from utils.metrics import prometheus_sample
+from utils.pool import pool_stats
+
+router = APIRouter(tags=["Metrics"])
+
+# Prometheus scrape endpoint
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    pool_lines = ["# TYPE db_pool_connections gauge"]
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        stats = pool_stats(pool)
+        for state in ("checked_out", "checked_in", "overflow"):
+            pool_lines.append(prometheus_sample("db_pool_connections", {"engine": name, "state": state}, stats[state]))
+    pool_lines.append("# TYPE event_subscribers gauge")
+    pool_lines.append(prometheus_sample("event_subscribers", {}, event_broker.subscriber_count()))
+    return PlainTextResponse(
+        request_metrics.render_prometheus(pool_lines),
+        media_type="text/plain; version=0.0.4"
+    )
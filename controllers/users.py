@@ -1,55 +1,114 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
 from models.user import UserModel
-from serializers.user import UserSchema, UserLogin, UserToken, UserResponseSchema
-from database import get_db
-from typing import List
+from serializers.user import UserSchema, UserLogin, UserToken, UserResponseSchema, RefreshRequest, LogoutRequest
+from database import get_async_db
+from dependencies.get_current_user import http_bearer, decode_token
+from services.denylist import denylist
+from services.password_hasher import password_hasher
+from typing import List, Optional
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserToken)
-def create_user(user: UserSchema, db: Session = Depends(get_db)):
-    # Check if the username or email already exists in the database
-    existing_user = db.query(UserModel).filter(
-        (UserModel.username == user.username) | (UserModel.email == user.email)
-    ).first()
+async def create_user(user: UserSchema, db: AsyncSession = Depends(get_async_db)):
+    # Hash the password in the hashing process pool
+    password_hash = await password_hasher.hash(user.password)
 
-    if existing_user:
+    # The unique constraints replace a separate existence check, which also
+    # closes the race between two registrations for the same name
+    result = await db.execute(
+        pg_insert(UserModel)
+        .values(username=user.username, email=user.email, password_hash=password_hash)
+        .on_conflict_do_nothing()
+        .returning(UserModel.id, UserModel.role)
+    )
+    row = result.first()
+    if row is None:
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Username or email already exists")
+    await db.commit()
 
-    # Create a new user instance
-    new_user = UserModel(username=user.username, email=user.email)
-    
-    # Hash the password using the model's set_password method
-    new_user.set_password(user.password)
-
-    # Add and commit the new user to the database
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    # Transient instance, only used to sign the tokens
+    new_user = UserModel(id=row.id, role=row.role, username=user.username, email=user.email)
 
     # Generate a JWT token so the user is logged in immediately after registration
     token = new_user.generate_token()
+    refresh_token = new_user.generate_refresh_token()
     
-    return {"token": token, "message": "User registered successfully"}
+    return {"token": token, "refresh_token": refresh_token, "message": "User registered successfully"}
 
 @router.post("/login", response_model=UserToken)
-def login(user: UserLogin, db: Session = Depends(get_db)):
+async def login(user: UserLogin, db: AsyncSession = Depends(get_async_db)):
     # Find the user by their unique username
-    db_user = db.query(UserModel).filter(UserModel.username == user.username).first()
+    result = await db.execute(select(UserModel).where(UserModel.username == user.username))
+    db_user = result.scalars().first()
 
     # Verify if user exists and the provided password matches the hashed password
-    if not db_user or not db_user.verify_password(user.password):
+    if not db_user:
+        raise HTTPException(status_code=400, detail="Invalid username or password")
+    verified, new_hash = await password_hasher.verify(user.password, db_user.password_hash)
+    if not verified:
         raise HTTPException(status_code=400, detail="Invalid username or password")
 
+    # The stored hash uses a different bcrypt cost than configured, so upgrade it
+    if new_hash:
+        db_user.password_hash = new_hash
+        await db.commit()
+
     # Generate a JWT token for the session
     token = db_user.generate_token()
+    refresh_token = db_user.generate_refresh_token()
 
     # Return the token and a success message
-    return {"token": token, "message": "Login successful"}
+    return {"token": token, "refresh_token": refresh_token, "message": "Login successful"}
+
+@router.post("/refresh", response_model=UserToken)
+async def refresh(data: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    payload = await decode_token(data.refresh_token, db, expected_type="refresh")
+
+    # Reload the user so a deleted account or changed role is picked up here
+    result = await db.execute(select(UserModel).where(UserModel.id == int(payload.get("sub"))))
+    db_user = result.scalars().first()
+    if not db_user:
+        raise HTTPException(status_code=401, detail="User no longer exists")
+
+    # Rotate: the old refresh token cannot be used again. The insert is the
+    # check, so a concurrent refresh with the same token loses here
+    if not await denylist.revoke(payload["jti"], datetime.fromtimestamp(payload["exp"], timezone.utc), db):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
+    return {
+        "token": db_user.generate_token(),
+        "refresh_token": db_user.generate_refresh_token(),
+        "message": "Token refreshed"
+    }
+
+@router.post("/logout")
+async def logout(
+    data: Optional[LogoutRequest] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token: HTTPAuthorizationCredentials = Depends(http_bearer)
+):
+    # Revoke the access token used for this request, and the refresh token if sent
+    payloads = [await decode_token(token.credentials, db)]
+    if data and data.refresh_token:
+        payloads.append(await decode_token(data.refresh_token, db, expected_type="refresh"))
+
+    for payload in payloads:
+        if payload.get("jti"):
+            if not await denylist.revoke(payload["jti"], datetime.fromtimestamp(payload["exp"], timezone.utc), db):
+                raise HTTPException(status_code=401, detail="Token has been revoked")
+
+    return {"message": "Logged out successfully"}
 
 @router.get("/", response_model=List[UserResponseSchema])
-def get_all_users(db: Session = Depends(get_db)):
+async def get_all_users(db: AsyncSession = Depends(get_async_db)):
     # Fetch all users from the database
-    users = db.query(UserModel).all()
+    result = await db.execute(select(UserModel))
+    users = result.scalars().all()
     return users
\ No newline at end of file
@@ -1,23 +1,29 @@
 # data/user_data.py
-
-from models.user import UserModel
+#
+# Demo accounts as plain data. Nothing is hashed at import time; passwords are
+# hashed by whoever seeds them (scripts/seed.py hashes each distinct one once).
+
+# Accounts the old Aurevia.py seed created
+DEMO_ACCOUNTS = [
+    {"username": "admin", "email": "admin@aurevia.com", "password": "admin123", "role": "admin"},
+    {"username": "aliqa", "email": "ali@aurevia.com", "password": "user123", "role": "user"},
+]
+
+TEST_USERS = [
+    {"username": "arjun_dev", "email": "arjun@devmail.in", "password": "securepassword1", "role": "user"},
+    {"username": "emma_johnson", "email": "emma.johnson@email.com", "password": "securepassword2", "role": "user"},
+    {"username": "fatima_ali", "email": "fatima.ali@mail.ae", "password": "securepassword3", "role": "user"},
+    {"username": "lucas_silva", "email": "lucas.silva@correo.br", "password": "securepassword4", "role": "user"},
+    {"username": "elena_popov", "email": "elena.popov@mail.ru", "password": "securepassword5", "role": "user"},
+]
 
 def create_test_users():
-    user1 = UserModel(username="arjun_dev", email="arjun@devmail.in")
-    user1.set_password("securepassword1")
-
-    user2 = UserModel(username="emma_johnson", email="emma.johnson@email.com")
-    user2.set_password("securepassword2")
-
-    user3 = UserModel(username="fatima_ali", email="fatima.ali@mail.ae")
-    user3.set_password("securepassword3")
-
-    user4 = UserModel(username="lucas_silva", email="lucas.silva@correo.br")
-    user4.set_password("securepassword4")
-
-    user5 = UserModel(username="elena_popov", email="elena.popov@mail.ru")
-    user5.set_password("securepassword5")
-
-    return [user1, user2, user3, user4, user5]
-
-user_list = create_test_users()
\ No newline at end of file
+    # Builds UserModel instances on demand; each one costs a bcrypt hash
+    from models.user import UserModel
+
+    users = []
+    for data in TEST_USERS:
+        user = UserModel(username=data["username"], email=data["email"], role=data["role"])
+        user.set_password(data["password"])
+        users.append(user)
+    return users
@@ -1,13 +1,37 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
-from config.environment import db_URI
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from config.environment import (
+    db_URI, db_pool_size, db_max_overflow, db_pool_timeout, db_pool_recycle, db_pool_pre_ping,
+    db_statement_timeout_ms, db_idle_in_transaction_timeout_ms
+)
 from sqlalchemy.orm import declarative_base
+from utils.pool import TimedQueuePool, TimedAsyncQueuePool
 
 Base = declarative_base()
 
+# Pool settings shared by both engines
+pool_options = {
+    "pool_size": db_pool_size,
+    "max_overflow": db_max_overflow,
+    "pool_timeout": db_pool_timeout,
+    "pool_recycle": db_pool_recycle,
+    "pool_pre_ping": db_pool_pre_ping,
+}
+
+# Postgres session settings so a slow query or an abandoned transaction cannot hold a connection forever
+server_settings = {
+    "statement_timeout": str(db_statement_timeout_ms),
+    "idle_in_transaction_session_timeout": str(db_idle_in_transaction_timeout_ms),
+}
+
 # Connect FastAPI with SQLAlchemy
 engine = create_engine(
-    db_URI
+    db_URI,
+    poolclass=TimedQueuePool,
+    connect_args={"options": " ".join(f"-c {k}={v}" for k, v in server_settings.items())},
+    **pool_options
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -18,4 +42,21 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Async engine for the async def routers, same database through the asyncpg driver
+async_engine = create_async_engine(
+    make_url(db_URI).set(drivername="postgresql+asyncpg"),
+    poolclass=TimedAsyncQueuePool,
+    connect_args={"server_settings": server_settings},
+    **pool_options
+)
+
+# expire_on_commit=False so committed objects can still be serialized without a lazy reload
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,32 +1,33 @@
 
 # dependencies/get_current_user.py
 
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import UserModel
-from database import get_db
+from database import get_async_db
+from services.denylist import denylist
 import jwt
 from jwt import DecodeError, ExpiredSignatureError # We import specific exceptions to handle them explicitly
-from config.environment import secret
+from config.environment import secret, auth_claims_only
 
 # We're using the HTTP Bearer scheme for the Authorization header
 http_bearer = HTTPBearer()
 
-# This function takes the database session and the JWT token from the request header
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(http_bearer)):
+# Lightweight stand-in for UserModel built only from the token claims.
+# Exposes the attributes the controllers read (id and role).
+@dataclass(frozen=True)
+class TokenPrincipal:
+    id: int
+    role: str
 
+# Decode and validate a token of the expected type ("access" or "refresh")
+async def decode_token(token: str, db: AsyncSession, expected_type: str = "access"):
     try:
         # Decode the token using the secret key
-        payload = jwt.decode(token.credentials, secret, algorithms=["HS256"])
-
-        # Query the database to find the user with the ID from the token's payload
-        user = db.query(UserModel).filter(UserModel.id == payload.get("sub")).first()
-
-        # If no user is found, raise an HTTP 401 Unauthorized error
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
-                                 detail="Invalid username or password")
+        payload = jwt.decode(token, secret, algorithms=["HS256"])
 
     # Handle decoding errors (invalid token)
     except DecodeError as e:
@@ -38,7 +39,36 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(http_be
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                              detail='Token has expired')
 
+    # Tokens issued before refresh tokens existed have no type and are access tokens
+    if payload.get("type", "access") != expected_type:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                             detail=f'Expected an {expected_type} token')
+
+    # Logged-out tokens are rejected; the in-memory filter avoids a query for the common case
+    if await denylist.is_revoked(payload.get("jti"), db):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                             detail='Token has been revoked')
+
+    return payload
+
+# This function takes the database session and the JWT token from the request header
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(http_bearer)):
+
+    payload = await decode_token(token.credentials, db)
+
+    # Claims-only mode: trust the signed claims and skip the user lookup
+    if auth_claims_only:
+        return TokenPrincipal(id=int(payload["sub"]), role=payload.get("role") or "user")
+
+    # Query the database to find the user with the ID from the token's payload
+    result = await db.execute(select(UserModel).where(UserModel.id == int(payload.get("sub"))))
+    user = result.scalars().first()
+
+    # If no user is found, raise an HTTP 401 Unauthorized error
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                             detail="Invalid username or password")
+
     # Return the user if the token is valid
     return user
 
-
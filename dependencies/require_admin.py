@@ -0,0 +1,14 @@
+# dependencies/require_admin.py
+
+from fastapi import Depends, HTTPException, status
+from models.user import UserModel
+from dependencies.get_current_user import get_current_user
+
+# Resolves to the current user, or rejects the request unless they are an admin
+def require_admin(current_user: UserModel = Depends(get_current_user)):
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
@@ -1,11 +1,64 @@
 # main.py
+from contextlib import asynccontextmanager
+from utils.import_timer import import_timer
+
+# Everything imported below is listed in the startup timing report
+import_timer.install()
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 from controllers import listings, users
-from controllers import inquiries
-# from controllers import auctions, inquiries 
+from controllers import inquiries, admin, metrics, auctions, events
+from database import engine, async_engine
+from services.password_hasher import password_hasher
+from services.events import event_broker
+from services.image_pipeline import image_pipeline
+from services.inquiry_buffer import inquiry_buffer
+from services.response_cache import response_cache
+from services.denylist import denylist
+from services.warmup import warmup, open_pool_connections, prebuild_validators
+from middleware.request_id import RequestIdMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.rate_limit import RateLimitMiddleware
+from services.request_metrics import instrument_engine
+from config.logging_config import setup_logging, shutdown_logging
+from config.environment import image_backend, media_root, media_url, inquiry_write_mode, warmup_db_connections, db_pool_size
+
+import_timer.uninstall()
+
+setup_logging()
+
+# Count SQL statements and DB time per request
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fork the hashing workers before the broker, image pipeline and inquiry
+    # buffer open sockets or start threads (only the log listener is running)
+    await password_hasher.warm()
+    # Listing changes made by other workers (postgres broker) also invalidate this worker's cache
+    event_broker.add_listener("listings", lambda message: response_cache.bump())
+    await event_broker.start()
+    await image_pipeline.start()
+    if inquiry_write_mode != "direct":
+        await inquiry_buffer.start()
+    # The worker takes no requests until this returns (or times out)
+    await warmup.run()
 
-app = FastAPI()
+    yield
+
+    await warmup.stop()
+    await event_broker.stop()
+    await image_pipeline.stop()
+    # Drains queued inquiries before the database engine goes away
+    await inquiry_buffer.stop()
+    password_hasher.shutdown()
+    shutdown_logging()
+
+app = FastAPI(lifespan=lifespan)
 
 # ✅ Allow your React dev server(s) to call the API
 origins = [
@@ -23,10 +76,38 @@ app.add_middleware(
     # so we are not setting allow_credentials.
 )
 
+# Inside the metrics middleware so 429s are counted
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
+
 app.include_router(users.router)
 app.include_router(listings.router)
 app.include_router(inquiries.router)
+app.include_router(auctions.router)
+app.include_router(events.router)
+app.include_router(admin.router)
+app.include_router(metrics.router)
+
+# Locally rendered image variants (the CDN serves them in production)
+if image_backend == "local":
+    app.mount(media_url, StaticFiles(directory=media_root, check_dir=False), name="media")
+
+# What the first requests to a fresh worker would otherwise pay for
+warmup.step("db_pool", lambda: open_pool_connections(min(warmup_db_connections, db_pool_size)))
+warmup.step("validators", lambda: prebuild_validators(app))
+warmup.step("denylist", denylist.sync)
+warmup.step("listing_caches", listings.prime_listing_caches)
 
 @app.get("/")
 def home():
-    return {"message": "Welcome to Aurevia Car Auction API"}
\ No newline at end of file
+    return {"message": "Welcome to Aurevia Car Auction API"}
+
+# Readiness probe: 503 until this worker has finished warming up
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    warmup.retry()
+    return JSONResponse(
+        status_code=200 if warmup.ready else 503,
+        content=warmup.status()
+    )
@@ -0,0 +1,55 @@
+# middleware/metrics.py
+
+import logging
+import time
+from services.request_metrics import request_metrics, query_stats_var, QueryStats
+from config.environment import metrics_query_budget, metrics_db_time_budget_ms
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    # Records latency, response size and SQL statement count/time per route,
+    # and logs requests that go over the query or DB time budget
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = query_stats_var.set(stats)
+        response = {"status": 500, "size": 0}
+
+        async def send_and_measure(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["size"] += len(message.get("body", b""))
+            await send(message)
+
+        request_metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_metrics.in_flight -= 1
+            query_stats_var.reset(token)
+
+            # Label by route template, not the raw path, to keep series bounded
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            request_metrics.record(scope["method"], route_path, response["status"], elapsed, response["size"], stats)
+
+            if stats.count > metrics_query_budget or stats.seconds * 1000 > metrics_db_time_budget_ms:
+                logger.warning("Request over DB budget", extra={
+                    "method": scope["method"],
+                    "route": route_path,
+                    "status": response["status"],
+                    "db_queries": stats.count,
+                    "db_ms": round(stats.seconds * 1000, 1),
+                    "duration_ms": round(elapsed * 1000, 1),
+                })
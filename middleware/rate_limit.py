@@ -0,0 +1,67 @@
+# middleware/rate_limit.py
+
+import json
+import jwt
+from services.rate_limiter import rate_limiter
+from config.environment import secret, rate_limit_trust_forwarded
+
+
+def _header(scope, name: bytes):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _client_ip(scope) -> str:
+    if rate_limit_trust_forwarded:
+        forwarded = _header(scope, b"x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _user_id(scope):
+    # Signature-checked claims only; the denylist (a DB lookup) is left to the route
+    authorization = _header(scope, b"authorization") or ""
+    if not authorization.lower().startswith("bearer "):
+        return None
+    try:
+        return jwt.decode(authorization[7:], secret, algorithms=["HS256"]).get("sub")
+    except jwt.PyJWTError:
+        return None
+
+
+class RateLimitMiddleware:
+    # Token-bucket limits per IP and per user on the routes in
+    # services/rate_limiter.RULES. Rejected requests get a 429 before any
+    # route code, so they never reach bcrypt or the database.
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        limits = rate_limiter.limits_for(scope["method"], scope["path"])
+        if not limits:
+            return await self.app(scope, receive, send)
+
+        user_id = _user_id(scope) if any(limit.scope == "user" for limit in limits) else None
+        retry_after = await rate_limiter.check(limits, _client_ip(scope), user_id)
+        if retry_after is None:
+            return await self.app(scope, receive, send)
+
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
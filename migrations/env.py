@@ -5,7 +5,7 @@ from sqlalchemy import pool
 
 from alembic import context
 
-from database import Base
+from models.base import Base # The declarative base the models register with
 import models # Import all models to register them
 
 # this is the Alembic Config object, which provides
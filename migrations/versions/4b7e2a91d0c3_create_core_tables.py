@@ -0,0 +1,92 @@
+"""Create core tables
+
+Revision ID: 4b7e2a91d0c3
+Revises: c53f16839f30
+Create Date: 2026-10-18 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2a91d0c3'
+down_revision: Union[str, Sequence[str], None] = 'c53f16839f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _timestamps():
+    return [
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases bootstrapped with Base.metadata.create_all already have
+    # these tables, so only create what is missing.
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table('users'):
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('password_hash', sa.String(), nullable=True),
+        sa.Column('role', sa.String(), nullable=True),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('username')
+        )
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+
+    if not inspector.has_table('listings'):
+        op.create_table('listings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('make', sa.String(), nullable=False),
+        sa.Column('model_year', sa.Integer(), nullable=False),
+        sa.Column('mileage', sa.Integer(), nullable=True),
+        sa.Column('spec', sa.String(), nullable=False),
+        sa.Column('exterior', sa.String(), nullable=False),
+        sa.Column('interior', sa.String(), nullable=False),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('notes', sa.String(), nullable=True),
+        sa.Column('images', postgresql.ARRAY(sa.String()), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=True),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_listings_id'), 'listings', ['id'], unique=False)
+
+    if not inspector.has_table('inquiries'):
+        op.create_table('inquiries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('full_name', sa.String(), nullable=False),
+        sa.Column('phone_number', sa.String(), nullable=False),
+        sa.Column('message', sa.String(), nullable=False),
+        sa.Column('listing_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(['listing_id'], ['listings.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_inquiries_id'), 'inquiries', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_inquiries_id'), table_name='inquiries')
+    op.drop_table('inquiries')
+    op.drop_index(op.f('ix_listings_id'), table_name='listings')
+    op.drop_table('listings')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_table('users')
@@ -0,0 +1,107 @@
+"""Normalize listing images into a clean text array
+
+Revision ID: 7a3e9c5b2d14
+Revises: 2f6c8d4e1a57
+Create Date: 2026-10-18 13:26:18.940217
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3e9c5b2d14'
+down_revision: Union[str, Sequence[str], None] = '2f6c8d4e1a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def _split(text):
+    return [url.strip() for url in text.strip('{}').split(',') if url.strip()]
+
+
+def normalize_images(value):
+    # One-time port of the repair that get_listing used to run on every request.
+    # Handles JSON strings, comma lists, Postgres array literals stored in a
+    # VARCHAR, and the "list of single characters" bug.
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            parsed = json.loads(value)
+        except ValueError:
+            return _split(value)
+        if isinstance(parsed, str):
+            return _split(parsed)
+        value = parsed if isinstance(parsed, list) else []
+    if len(value) > 10 and all(isinstance(item, str) and len(item) == 1 for item in value):
+        return _split(''.join(value))
+    return [img.strip() for img in value if isinstance(img, str) and img.strip().startswith('http')]
+
+
+def _backfill(source_column):
+    conn = op.get_bind()
+    # From the legacy column only rows not copied yet, so a re-run after a
+    # failure resumes instead of overwriting what was already converted
+    pending = " AND images IS NULL" if source_column == 'images_legacy' else ""
+    select_batch = sa.text(
+        f"SELECT id, {source_column} FROM listings WHERE id > :last_id{pending} ORDER BY id LIMIT :batch"
+    )
+    update_row = sa.text("UPDATE listings SET images = :images WHERE id = :id").bindparams(
+        sa.bindparam('images', type_=postgresql.ARRAY(sa.String()))
+    )
+
+    last_id = 0
+    while True:
+        rows = conn.execute(select_batch, {"last_id": last_id, "batch": BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        changes = []
+        for row_id, raw in rows:
+            images = normalize_images(raw)
+            if source_column != 'images' or images != raw:
+                changes.append({"id": row_id, "images": images})
+        if changes:
+            conn.execute(update_row, changes)
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = {c['name']: c['type'] for c in sa.inspect(op.get_bind()).get_columns('listings')}
+
+    if 'images_legacy' in columns:
+        # An earlier run failed part way through the backfill; carry on from it
+        source_column = 'images_legacy'
+    elif isinstance(columns['images'], sa.ARRAY):
+        source_column = 'images'
+    else:
+        # Older databases still store images as VARCHAR; move it aside and
+        # rebuild the column as an array
+        op.alter_column('listings', 'images', new_column_name='images_legacy')
+        op.add_column('listings', sa.Column('images', postgresql.ARRAY(sa.String()), nullable=True))
+        source_column = 'images_legacy'
+
+    # Autocommit, so each row's UPDATE commits on its own and a large table is
+    # never locked for the whole backfill. The legacy column is only dropped
+    # once a pass has completed.
+    with op.get_context().autocommit_block():
+        _backfill(source_column)
+
+    if source_column == 'images_legacy':
+        op.drop_column('listings', 'images_legacy')
+
+    op.execute("UPDATE listings SET images = '{}' WHERE images IS NULL")
+    op.alter_column('listings', 'images', nullable=False, server_default=sa.text("'{}'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The repaired values are kept; only the constraint and default are removed
+    op.alter_column('listings', 'images', nullable=True, server_default=None)
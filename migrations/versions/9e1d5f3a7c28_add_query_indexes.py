@@ -0,0 +1,59 @@
+"""Add query indexes for listings and inquiries
+
+Revision ID: 9e1d5f3a7c28
+Revises: 4b7e2a91d0c3
+Create Date: 2026-10-18 09:31:07.218845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1d5f3a7c28'
+down_revision: Union[str, Sequence[str], None] = '4b7e2a91d0c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns) - kept in sync with the Index() definitions on the models
+INDEXES = [
+    # get_listing_inquiries (admin): WHERE listing_id = ? ORDER BY created_at DESC
+    ('ix_inquiries_listing_id_created_at', 'inquiries',
+     ['listing_id', 'created_at DESC']),
+    # get_listing_inquiries (user): WHERE listing_id = ? AND user_id = ? ORDER BY created_at DESC
+    ('ix_inquiries_listing_id_user_id_created_at', 'inquiries',
+     ['listing_id', 'user_id', 'created_at DESC']),
+    # get_all_listings: status filter with keyset on (price, id)
+    ('ix_listings_status_price', 'listings', ['status', 'price', 'id']),
+    # get_all_listings: make filter with model_year range
+    ('ix_listings_make_model_year', 'listings', ['make', 'model_year']),
+    # get_all_listings default sort: keyset on (created_at, id)
+    ('ix_listings_created_at_id', 'listings', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, [sa.text(c) for c in columns],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
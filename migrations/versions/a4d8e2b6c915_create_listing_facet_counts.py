@@ -0,0 +1,59 @@
+"""Create listing_facet_counts summary table
+
+Revision ID: a4d8e2b6c915
+Revises: f3c6d9a2e471
+Create Date: 2026-10-18 20:27:51.160384
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8e2b6c915'
+down_revision: Union[str, Sequence[str], None] = 'f3c6d9a2e471'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kept in sync with services/listing_facets.PRICE_BUCKETS
+PRICE_BUCKET_SQL = (
+    "CASE WHEN price < 10000 THEN '0-10000' "
+    "WHEN price < 25000 THEN '10000-25000' "
+    "WHEN price < 50000 THEN '25000-50000' "
+    "WHEN price < 100000 THEN '50000-100000' "
+    "WHEN price < 250000 THEN '100000-250000' "
+    "WHEN price < 500000 THEN '250000-500000' "
+    "ELSE '500000+' END"
+)
+
+FACET_SQL = {
+    'make': 'make',
+    'spec': 'spec',
+    'status': 'status',
+    'model_year': 'model_year::text',
+    'price': PRICE_BUCKET_SQL,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('listing_facet_counts',
+    sa.Column('facet', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value')
+    )
+    # One pass per facet over the existing listings
+    for facet, expression in FACET_SQL.items():
+        op.execute(
+            f"INSERT INTO listing_facet_counts (facet, value, count) "
+            f"SELECT '{facet}', {expression}, count(*) FROM listings "
+            f"WHERE {expression} IS NOT NULL GROUP BY 2"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('listing_facet_counts')
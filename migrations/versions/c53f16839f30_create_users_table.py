@@ -20,43 +20,15 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_index(op.f('ix_listings_id'), table_name='listings')
-    op.drop_table('listings')
-    op.drop_index(op.f('ix_users_id'), table_name='users')
-    op.drop_table('users')
-    # ### end Alembic commands ###
+    # Intentionally empty. As autogenerated this revision dropped `listings`
+    # and `users`, which fails on an empty database and destroys data on an
+    # unstamped one. 4b7e2a91d0c3 creates whichever core tables are missing,
+    # so `alembic upgrade head` works on both; a database that already ran
+    # the old version of this revision is unaffected.
+    pass
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.create_table('users',
-    sa.Column('id', sa.INTEGER(), server_default=sa.text("nextval('users_id_seq'::regclass)"), autoincrement=True, nullable=False),
-    sa.Column('username', sa.VARCHAR(), autoincrement=False, nullable=False),
-    sa.Column('email', sa.VARCHAR(), autoincrement=False, nullable=False),
-    sa.Column('password_hash', sa.VARCHAR(), autoincrement=False, nullable=True),
-    sa.Column('role', sa.VARCHAR(), autoincrement=False, nullable=False),
-    sa.PrimaryKeyConstraint('id', name='users_pkey'),
-    sa.UniqueConstraint('email', name='users_email_key', postgresql_include=[], postgresql_nulls_not_distinct=False),
-    sa.UniqueConstraint('username', name='users_username_key', postgresql_include=[], postgresql_nulls_not_distinct=False),
-    postgresql_ignore_search_path=False
-    )
-    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
-    op.create_table('listings',
-    sa.Column('id', sa.INTEGER(), autoincrement=True, nullable=False),
-    sa.Column('make', sa.VARCHAR(), autoincrement=False, nullable=False),
-    sa.Column('model_year', sa.INTEGER(), autoincrement=False, nullable=False),
-    sa.Column('spec', sa.VARCHAR(), autoincrement=False, nullable=False),
-    sa.Column('status', sa.VARCHAR(), autoincrement=False, nullable=True),
-    sa.Column('exterior', sa.VARCHAR(), autoincrement=False, nullable=False),
-    sa.Column('interior', sa.VARCHAR(), autoincrement=False, nullable=False),
-    sa.Column('price', sa.DOUBLE_PRECISION(precision=53), autoincrement=False, nullable=False),
-    sa.Column('notes', sa.VARCHAR(), autoincrement=False, nullable=True),
-    sa.Column('images', sa.VARCHAR(), autoincrement=False, nullable=True),
-    sa.Column('owner_id', sa.INTEGER(), autoincrement=False, nullable=True),
-    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], name=op.f('listings_owner_id_fkey')),
-    sa.PrimaryKeyConstraint('id', name=op.f('listings_pkey'))
-    )
-    op.create_index(op.f('ix_listings_id'), 'listings', ['id'], unique=False)
-    # ### end Alembic commands ###
+    # Nothing to undo; 4b7e2a91d0c3's downgrade drops the core tables
+    pass
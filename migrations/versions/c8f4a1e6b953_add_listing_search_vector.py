@@ -0,0 +1,53 @@
+"""Add generated search_vector column to listings
+
+Revision ID: c8f4a1e6b953
+Revises: 7a3e9c5b2d14
+Create Date: 2026-10-18 14:48:33.127605
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f4a1e6b953'
+down_revision: Union[str, Sequence[str], None] = '7a3e9c5b2d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "to_tsvector('english', "
+    "coalesce(make, '') || ' ' || model_year::text || ' ' || coalesce(spec, '') || ' ' || "
+    "coalesce(exterior, '') || ' ' || coalesce(interior, '') || ' ' || coalesce(notes, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('listings', sa.Column(
+        'search_vector', postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True
+    ))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_listings_search_vector', 'listings', ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_listings_search_vector', table_name='listings',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('listings', 'search_vector')
@@ -0,0 +1,65 @@
+"""Create auctions and bids tables
+
+Revision ID: d2b7e8f15a36
+Revises: c8f4a1e6b953
+Create Date: 2026-10-18 16:02:44.381950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e8f15a36'
+down_revision: Union[str, Sequence[str], None] = 'c8f4a1e6b953'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('auctions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('listing_id', sa.Integer(), nullable=False),
+    sa.Column('starting_price', sa.Float(), nullable=False),
+    sa.Column('min_increment', sa.Float(), nullable=False),
+    sa.Column('starts_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('ends_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('current_price', sa.Float(), nullable=True),
+    sa.Column('highest_bidder_id', sa.Integer(), nullable=True),
+    sa.Column('bid_count', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['listing_id'], ['listings.id']),
+    sa.ForeignKeyConstraint(['highest_bidder_id'], ['users.id']),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_auctions_id'), 'auctions', ['id'], unique=False)
+    op.create_index(op.f('ix_auctions_listing_id'), 'auctions', ['listing_id'], unique=False)
+    op.create_table('bids',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('auction_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['auction_id'], ['auctions.id']),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_bids_id'), 'bids', ['id'], unique=False)
+    op.create_index('ix_bids_auction_id_amount', 'bids', ['auction_id', sa.text('amount DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_bids_auction_id_amount', table_name='bids')
+    op.drop_index(op.f('ix_bids_id'), table_name='bids')
+    op.drop_table('bids')
+    op.drop_index(op.f('ix_auctions_listing_id'), table_name='auctions')
+    op.drop_index(op.f('ix_auctions_id'), table_name='auctions')
+    op.drop_table('auctions')
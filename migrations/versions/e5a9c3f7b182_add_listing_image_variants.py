@@ -0,0 +1,34 @@
+"""Add image_variants to listings
+
+Revision ID: e5a9c3f7b182
+Revises: d2b7e8f15a36
+Create Date: 2026-10-18 17:41:09.527316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3f7b182'
+down_revision: Union[str, Sequence[str], None] = 'd2b7e8f15a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant default is metadata-only, so this does not rewrite the table.
+    # Existing listings get their variants from the pipeline's startup sweep.
+    op.add_column('listings', sa.Column(
+        'image_variants', postgresql.JSONB(astext_type=sa.Text()),
+        nullable=False, server_default=sa.text("'[]'::jsonb")
+    ))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('listings', 'image_variants')
@@ -0,0 +1,43 @@
+"""Add ingest_id to inquiries for buffered submissions
+
+Revision ID: f3c6d9a2e471
+Revises: e5a9c3f7b182
+Create Date: 2026-10-18 19:12:36.804129
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c6d9a2e471'
+down_revision: Union[str, Sequence[str], None] = 'e5a9c3f7b182'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable with no default: a metadata-only change
+    op.add_column('inquiries', sa.Column('ingest_id', sa.String(length=32), nullable=True))
+    # Unique so replaying the journal after a crash cannot insert twice
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_inquiries_ingest_id', 'inquiries', ['ingest_id'],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_inquiries_ingest_id', table_name='inquiries',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column('inquiries', 'ingest_id')
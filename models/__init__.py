@@ -6,6 +6,9 @@ from .base import BaseModel
 from . import user  # defines UserModel
 from . import listing
 from . import inquiry
+from . import revoked_token
+from . import auction
+from . import listing_facet
 # add future models here as needed
 
 __all__ = ["BaseModel"]
\ No newline at end of file
@@ -0,0 +1,37 @@
+# models/auction.py
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from .base import BaseModel
+
+class AuctionModel(BaseModel):
+    __tablename__ = "auctions"
+
+    listing_id = Column(Integer, ForeignKey("listings.id"), nullable=False, index=True)
+    starting_price = Column(Float, nullable=False)
+    min_increment = Column(Float, nullable=False, default=100)
+    starts_at = Column(DateTime(timezone=True), nullable=False)
+    ends_at = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String, nullable=False, default="active")  # "active" or "cancelled"
+
+    # Highest accepted bid, maintained by the same UPDATE that accepts a bid
+    current_price = Column(Float, nullable=True)
+    highest_bidder_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    bid_count = Column(Integer, nullable=False, default=0)
+    version = Column(Integer, nullable=False, default=0)
+
+    listing = relationship("ListingModel")
+    bids = relationship("BidModel", back_populates="auction")
+
+class BidModel(BaseModel):
+    __tablename__ = "bids"
+
+    auction_id = Column(Integer, ForeignKey("auctions.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    amount = Column(Float, nullable=False)
+
+    auction = relationship("AuctionModel", back_populates="bids")
+    user = relationship("UserModel")
+
+# Bid history for an auction, highest first
+Index("ix_bids_auction_id_amount", BidModel.auction_id, BidModel.amount.desc())
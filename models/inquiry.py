@@ -1,8 +1,7 @@
 # models/inquiry.py
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
-from datetime import datetime, timezone
 from .base import BaseModel
 
 class InquiryModel(BaseModel):
@@ -14,11 +13,20 @@ class InquiryModel(BaseModel):
     message = Column(String, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=func.now())
+
+    # Provisional id handed out by buffered submissions (services/inquiry_buffer)
+    ingest_id = Column(String(32), nullable=True, unique=True, index=True)
 
     # Relationships
     listing_id = Column(Integer, ForeignKey("listings.id"), nullable=False)
     listing = relationship("ListingModel") 
 
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    user = relationship("UserModel", back_populates="inquiries")
\ No newline at end of file
+    user = relationship("UserModel", back_populates="inquiries")
+
+# Indexes for get_listing_inquiries (admin and per-user variants)
+Index("ix_inquiries_listing_id_created_at",
+      InquiryModel.listing_id, InquiryModel.created_at.desc())
+Index("ix_inquiries_listing_id_user_id_created_at",
+      InquiryModel.listing_id, InquiryModel.user_id, InquiryModel.created_at.desc())
\ No newline at end of file
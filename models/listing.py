@@ -1,12 +1,29 @@
 # models/listing.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, JSONB
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from .base import BaseModel
 
+# Text searched by /api/listings/search (kept in sync with services/search_index.SEARCH_FIELDS)
+SEARCH_VECTOR_SQL = (
+    "to_tsvector('english', "
+    "coalesce(make, '') || ' ' || model_year::text || ' ' || coalesce(spec, '') || ' ' || "
+    "coalesce(exterior, '') || ' ' || coalesce(interior, '') || ' ' || coalesce(notes, ''))"
+)
+
 class ListingModel(BaseModel):
     __tablename__ = "listings"
+    __table_args__ = (
+        # Browsing: status filter with keyset pagination on (price, id)
+        Index("ix_listings_status_price", "status", "price", "id"),
+        # Browsing: make filter with a model_year range
+        Index("ix_listings_make_model_year", "make", "model_year"),
+        # Default sort: keyset pagination on (created_at, id)
+        Index("ix_listings_created_at_id", "created_at", "id"),
+        # Full-text search
+        Index("ix_listings_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     make = Column(String, nullable=False)
     model_year = Column(Integer, nullable=False)
@@ -17,7 +34,11 @@ class ListingModel(BaseModel):
     price = Column(Float, nullable=False)
     status = Column(String)
     notes = Column(String)
-    images = Column(ARRAY(String)) 
+    images = Column(ARRAY(String), nullable=False, default=list, server_default="{}")
+    # One {"thumbnail", "card", "full"} URL dict per image, filled in by services/image_pipeline
+    image_variants = Column(JSONB, nullable=False, default=list, server_default="[]")
     owner_id = Column(Integer, ForeignKey("users.id"))
+    # Generated by Postgres; deferred so normal reads do not select it
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
 
     owner = relationship("UserModel", back_populates="listings")
\ No newline at end of file
@@ -0,0 +1,13 @@
+# models/listing_facet.py
+
+from sqlalchemy import Column, Integer, String
+from .base import Base
+
+class ListingFacetCountModel(Base):
+    # Unfiltered facet counts for /api/listings/facets, adjusted by every
+    # listing write in the same transaction (services/listing_facets)
+    __tablename__ = "listing_facet_counts"
+
+    facet = Column(String, primary_key=True)  # "make", "spec", "status", "model_year" or "price"
+    value = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
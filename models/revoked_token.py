@@ -0,0 +1,11 @@
+# models/revoked_token.py
+
+from sqlalchemy import Column, String, DateTime
+from .base import BaseModel
+
+class RevokedTokenModel(BaseModel):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String, nullable=False, unique=True, index=True)
+    # Rows past this time can be purged; the token would be rejected as expired anyway
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -2,14 +2,12 @@
 
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
-from passlib.context import CryptContext
 from datetime import datetime, timezone, timedelta  # New import for timestamps
 from .base import BaseModel
 import jwt
-
-# Creating a password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-from config.environment import secret
+import uuid
+from utils.passwords import pwd_context  # bcrypt context; cost comes from BCRYPT_ROUNDS
+from config.environment import secret, access_token_minutes, refresh_token_days
 
 class UserModel(BaseModel):
 
@@ -32,13 +30,23 @@ class UserModel(BaseModel):
     def verify_password(self, password: str) -> bool:
         return pwd_context.verify(password, self.password_hash)
 
-    # Added indentation to make it a method of UserModel
+    # Short-lived access token carrying the claims get_current_user needs
     def generate_token(self):
+        return self._encode_token("access", timedelta(minutes=access_token_minutes))
+
+    # Long-lived token that can only be exchanged for a new access token
+    def generate_refresh_token(self):
+        return self._encode_token("refresh", timedelta(days=refresh_token_days))
+
+    def _encode_token(self, token_type: str, lifetime: timedelta):
+        now = datetime.now(timezone.utc)
         payload = {
-            "exp": datetime.now(timezone.utc) + timedelta(days=1),
-            "iat": datetime.now(timezone.utc),
+            "exp": now + lifetime,
+            "iat": now,
             "sub": str(self.id),
-            "role": self.role 
+            "role": self.role,
+            "type": token_type,
+            "jti": uuid.uuid4().hex  # Lets a single token be revoked
         }
         token = jwt.encode(payload, secret, algorithm="HS256")
         return token
\ No newline at end of file
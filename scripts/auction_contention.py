@@ -0,0 +1,144 @@
+# scripts/auction_contention.py
+#
+# Fires thousands of simultaneous bids at one auction through services.bidding
+# and checks that no accepted bid was lost or applied out of order.
+#
+#   python -m scripts.auction_contention --bids 5000 --concurrency 50
+#
+# Creates its own listing, users and auction in the configured database and
+# deletes them (with their bids) afterwards. tests/test_auction_contention.py
+# runs a smaller round when DB_URI is set.
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, delete
+from database import AsyncSessionLocal, async_engine
+from models.auction import AuctionModel, BidModel
+from models.listing import ListingModel
+from models.user import UserModel
+from services import bidding
+from services.bidding import BidRejected
+from services.listing_facets import facet_values, adjust_facets
+
+
+async def create_fixture(bidder_count: int):
+    suffix = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        users = [
+            UserModel(username=f"bidder_{suffix}_{i}", email=f"bidder_{suffix}_{i}@example.com", role="user")
+            for i in range(bidder_count)
+        ]
+        listing = ListingModel(
+            make="Contention Test", model_year=2024, mileage=0, spec="GCC",
+            exterior="Black", interior="Black", price=100000, status="Available", images=[]
+        )
+        db.add_all(users + [listing])
+        await db.flush()
+        await adjust_facets(db, added=[facet_values(listing)])
+        now = datetime.now(timezone.utc)
+        auction = AuctionModel(
+            listing_id=listing.id, starting_price=1000, min_increment=10,
+            starts_at=now - timedelta(minutes=1), ends_at=now + timedelta(hours=1),
+            status="active", bid_count=0, version=0
+        )
+        db.add(auction)
+        await db.commit()
+        return auction.id, listing.id, [user.id for user in users]
+
+
+async def remove_fixture(auction_id: int, listing_id: int, user_ids: list):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(BidModel).where(BidModel.auction_id == auction_id))
+        await db.execute(delete(AuctionModel).where(AuctionModel.id == auction_id))
+        result = await db.execute(
+            delete(ListingModel)
+            .where(ListingModel.id == listing_id)
+            .returning(*[getattr(ListingModel, name) for name in ("make", "spec", "status", "model_year", "price")])
+        )
+        await adjust_facets(db, removed=[facet_values(dict(row._mapping)) for row in result])
+        await db.execute(delete(UserModel).where(UserModel.id.in_(user_ids)))
+        await db.commit()
+
+
+async def fire_bids(auction_id: int, user_ids: list, bid_count: int, concurrency: int):
+    gate = asyncio.Semaphore(concurrency)
+    accepted, rejected = [], 0
+
+    async def one_bid(amount):
+        nonlocal rejected
+        async with gate, AsyncSessionLocal() as db:
+            try:
+                bid = await bidding.place_bid(db, auction_id, random.choice(user_ids), amount)
+                accepted.append((bid.id, bid.amount))
+            except BidRejected:
+                rejected += 1
+
+    # Amounts mostly rise but arrive shuffled, like a crowd near closing time
+    amounts = [1000 + i * 10 + random.choice([0, 0, 5, -30]) for i in range(bid_count)]
+    random.shuffle(amounts)
+    await asyncio.gather(*(one_bid(amount) for amount in amounts))
+    return accepted, rejected
+
+
+async def verify(auction_id: int, accepted: list) -> list:
+    problems = []
+    async with AsyncSessionLocal() as db:
+        auction = await db.get(AuctionModel, auction_id)
+        bids = (await db.execute(
+            select(BidModel).where(BidModel.auction_id == auction_id).order_by(BidModel.id)
+        )).scalars().all()
+
+    if len(bids) != len(accepted):
+        problems.append(f"{len(accepted)} bids acknowledged but {len(bids)} stored")
+    if auction.bid_count != len(bids):
+        problems.append(f"bid_count is {auction.bid_count} but {len(bids)} bids stored")
+    # Bids are inserted under the auction row lock, so id order is acceptance order
+    for previous, bid in zip(bids, bids[1:]):
+        if bid.amount < previous.amount + auction.min_increment:
+            problems.append(f"bid {bid.id} ({bid.amount}) accepted after {previous.id} ({previous.amount})")
+    if bids and auction.current_price != bids[-1].amount:
+        problems.append(f"current_price {auction.current_price} != last accepted bid {bids[-1].amount}")
+    if bids and auction.current_price != max(amount for _, amount in accepted):
+        problems.append("current_price is not the highest acknowledged bid")
+    return problems
+
+
+async def run(bid_count: int, concurrency: int, bidders: int) -> dict:
+    auction_id, listing_id, user_ids = await create_fixture(bidders)
+    try:
+        started = time.perf_counter()
+        accepted, rejected = await fire_bids(auction_id, user_ids, bid_count, concurrency)
+        elapsed = time.perf_counter() - started
+        problems = await verify(auction_id, accepted)
+    finally:
+        await remove_fixture(auction_id, listing_id, user_ids)
+    return {"auction_id": auction_id, "accepted": len(accepted), "rejected": rejected,
+            "elapsed": elapsed, "problems": problems}
+
+
+async def main(bid_count: int, concurrency: int, bidders: int):
+    try:
+        summary = await run(bid_count, concurrency, bidders)
+    finally:
+        await async_engine.dispose()
+
+    elapsed, problems = summary["elapsed"], summary["problems"]
+    print(f"auction {summary['auction_id']}: {summary['accepted']} accepted, {summary['rejected']} rejected "
+          f"in {elapsed:.2f}s ({bid_count / elapsed:.0f} bids/s)")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent bidding consistency check")
+    parser.add_argument("--bids", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--bidders", type=int, default=100)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.bids, args.concurrency, args.bidders)))
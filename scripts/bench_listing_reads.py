@@ -0,0 +1,138 @@
+# scripts/bench_listing_reads.py
+#
+# Compares listing page serialization: the old ORM + pydantic path against
+# the Core projection + orjson path in controllers.listings.
+#
+#   python -m scripts.bench_listing_reads --rows 50000 --page-size 100
+#   python -m scripts.bench_listing_reads --rows 50000 --allow-writes
+#
+# Reads whatever is in the configured database. With --allow-writes it first
+# tops the listings table up to --rows synthetic rows (facet counts included)
+# and deletes them again afterwards unless --keep-rows is given.
+
+import argparse
+import asyncio
+import random
+import time
+from sqlalchemy import select, insert, delete, func, tuple_
+from database import AsyncSessionLocal, async_engine
+from models.listing import ListingModel
+from services.listing_facets import facet_values, adjust_facets
+from controllers.listings import (
+    ListingPage, LISTING_FIELDS, listing_filters, listing_page_json, decode_cursor, encode_cursor
+)
+from scripts.synthetic_data import generate_listing
+import orjson
+
+BATCH_SIZE = 5000
+
+
+async def count_rows() -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(ListingModel))
+
+
+async def add_rows(count: int) -> list:
+    # Returns the new ids so the rows can be removed after the run
+    rng = random.Random(0)
+    ids = []
+    async with AsyncSessionLocal() as db:
+        for start in range(0, count, BATCH_SIZE):
+            rows = [generate_listing(rng) for _ in range(min(BATCH_SIZE, count - start))]
+            result = await db.execute(insert(ListingModel).returning(ListingModel.id), rows)
+            ids.extend(result.scalars().all())
+            await adjust_facets(db, added=[facet_values(row) for row in rows])
+            await db.commit()
+    return ids
+
+
+async def remove_rows(ids: list):
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(ids), BATCH_SIZE):
+            result = await db.execute(
+                delete(ListingModel)
+                .where(ListingModel.id.in_(ids[start:start + BATCH_SIZE]))
+                .returning(*[getattr(ListingModel, name) for name in ("make", "spec", "status", "model_year", "price")])
+            )
+            await adjust_facets(db, removed=[facet_values(dict(row._mapping)) for row in result])
+            await db.commit()
+
+
+# The read path before the projection change, kept here for comparison
+async def orm_page_json(db, limit, cursor) -> bytes:
+    query = select(ListingModel)
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, "created_at")
+        query = query.filter(tuple_(ListingModel.created_at, ListingModel.id) < (last_value, last_id))
+    query = query.order_by(ListingModel.created_at.desc(), ListingModel.id.desc())
+    listings = (await db.execute(query.limit(limit + 1))).scalars().all()
+    next_cursor = None
+    if len(listings) > limit:
+        listings = listings[:limit]
+        next_cursor = encode_cursor(listings[-1].created_at, listings[-1].id)
+    page = ListingPage.model_validate({"items": listings, "next_cursor": next_cursor}, from_attributes=True)
+    return page.model_dump_json().encode()
+
+
+async def walk(name: str, fetch_page, max_rows: int, page_size: int):
+    rows, pages, body_bytes, cursor = 0, 0, 0, None
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        while rows < max_rows:
+            body = await fetch_page(db, page_size, cursor)
+            page = orjson.loads(body)
+            rows += len(page["items"])
+            body_bytes += len(body)
+            pages += 1
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+            # Each request gets a fresh identity map in the app
+            db.expunge_all()
+    elapsed = time.perf_counter() - started
+    print(f"{name:<28} {rows:>7} rows  {pages:>5} pages  {elapsed:7.2f}s  "
+          f"{rows / elapsed:>9.0f} rows/s  {body_bytes / rows:6.0f} B/row")
+
+
+async def main(target_rows: int, page_size: int, allow_writes: bool, keep_rows: bool):
+    existing = await count_rows()
+    missing = target_rows - existing
+    added = []
+    if missing > 0 and allow_writes:
+        added = await add_rows(missing)
+        print(f"inserted {len(added)} synthetic listings")
+    elif missing > 0:
+        print(f"only {existing} listings; pass --allow-writes to add {missing} synthetic ones")
+    if not existing and not added:
+        # Nothing to read, and the per-row figures would divide by zero
+        await async_engine.dispose()
+        return
+
+    filters = listing_filters()
+    sparse = ["id", "make", "price", "images"]
+
+    def projection(fields):
+        async def fetch(db, limit, cursor):
+            return await listing_page_json(db, "-created_at", limit, cursor, filters, fields)
+        return fetch
+
+    try:
+        await walk("orm + pydantic (before)", orm_page_json, target_rows, page_size)
+        await walk("core + orjson, all fields", projection(LISTING_FIELDS), target_rows, page_size)
+        await walk("core + orjson, " + ",".join(sparse), projection(sparse), target_rows, page_size)
+    finally:
+        if added and not keep_rows:
+            await remove_rows(added)
+            print(f"removed {len(added)} synthetic listings")
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Listing read path benchmark")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--allow-writes", action="store_true",
+                        help="Insert synthetic listings into the configured database if it has fewer than --rows")
+    parser.add_argument("--keep-rows", action="store_true", help="Leave the inserted listings in place")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.page_size, args.allow_writes, args.keep_rows))
@@ -0,0 +1,72 @@
+# scripts/explain_queries.py
+#
+# Prints the Postgres EXPLAIN plan for the queries the controllers run.
+#
+#   python -m scripts.explain_queries              # plans against the current schema
+#   python -m scripts.explain_queries --upgrade    # plans, alembic upgrade head, plans again
+
+import argparse
+import subprocess
+import sys
+from sqlalchemy import create_engine, select, tuple_
+from sqlalchemy.dialects import postgresql
+from models.listing import ListingModel
+from models.inquiry import InquiryModel
+from config.environment import db_URI
+
+
+def controller_queries(listing_id=1, user_id=1):
+    # Each entry mirrors a query built in controllers/
+    return {
+        "get_listing_inquiries (admin)": select(InquiryModel)
+            .where(InquiryModel.listing_id == listing_id)
+            .order_by(InquiryModel.created_at.desc()),
+        "get_listing_inquiries (user)": select(InquiryModel)
+            .where(InquiryModel.listing_id == listing_id, InquiryModel.user_id == user_id)
+            .order_by(InquiryModel.created_at.desc()),
+        "get_all_listings (status, sort=price)": select(ListingModel)
+            .where(ListingModel.status == "Available")
+            .where(tuple_(ListingModel.price, ListingModel.id) > (50000, 0))
+            .order_by(ListingModel.price.asc(), ListingModel.id.asc())
+            .limit(21),
+        "get_all_listings (make, year range)": select(ListingModel)
+            .where(ListingModel.make == "Toyota")
+            .where(ListingModel.model_year >= 2018, ListingModel.model_year <= 2022)
+            .order_by(ListingModel.created_at.desc(), ListingModel.id.desc())
+            .limit(21),
+        "get_all_listings (default sort)": select(ListingModel)
+            .order_by(ListingModel.created_at.desc(), ListingModel.id.desc())
+            .limit(21),
+    }
+
+
+def print_plans(engine, heading, analyze=False):
+    print(f"\n{'=' * 20} {heading} {'=' * 20}")
+    explain = "EXPLAIN (ANALYZE, BUFFERS) " if analyze else "EXPLAIN "
+    with engine.connect() as conn:
+        for name, stmt in controller_queries().items():
+            compiled = stmt.compile(dialect=postgresql.dialect())
+            rows = conn.exec_driver_sql(explain + str(compiled), compiled.params).fetchall()
+            print(f"\n-- {name}")
+            for (line,) in rows:
+                print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print EXPLAIN plans for controller queries")
+    parser.add_argument("--upgrade", action="store_true",
+                        help="run 'alembic upgrade head' and print the plans again")
+    parser.add_argument("--analyze", action="store_true",
+                        help="use EXPLAIN ANALYZE (executes the queries)")
+    args = parser.parse_args()
+
+    engine = create_engine(db_URI)
+    print_plans(engine, "before" if args.upgrade else "current schema", args.analyze)
+
+    if args.upgrade:
+        subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], check=True)
+        print_plans(engine, "after", args.analyze)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,402 @@
+# scripts/load_test.py
+#
+# Drives every HTTP route of a running API with concurrent requests and
+# writes throughput and latency percentiles per endpoint to a JSON file that
+# can be diffed between releases. Runs offline against a local server and
+# database (tokens are minted locally with the configured secret).
+#
+#   uvicorn main:app &
+#   python -m scripts.load_test --generate --users 1000 --listings 50000 --inquiries 20000
+#   python -m scripts.load_test --requests 500 --concurrency 20 --out results.json
+#
+# Write endpoints use rows prepared for them in the database beforehand, so
+# each request has something of its own to update, delete or cancel.
+#
+# /login, /register and inquiry submission are rate limited, so with the
+# default limits most of their requests measure the 429 path (counted as ok,
+# see RATE_LIMITED). To measure the handlers themselves, start the server with
+#   RATE_LIMIT_LOGIN_IP=off RATE_LIMIT_REGISTER_IP=off RATE_LIMIT_INQUIRY_IP=off RATE_LIMIT_INQUIRY_USER=off
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+import httpx
+from sqlalchemy import select, insert, func
+from database import AsyncSessionLocal, async_engine
+from models.user import UserModel
+from models.listing import ListingModel
+from models.inquiry import InquiryModel
+from models.auction import AuctionModel
+from scripts import synthetic_data
+from scripts.synthetic_data import generate_listing, generate_inquiry, ensure_user, DEFAULT_PASSWORD
+
+# Accepted statuses for scenarios behind services/rate_limiter.RULES
+RATE_LIMITED = (200, 429)
+
+# Long-lived streams have no meaningful per-request latency
+SKIPPED_ROUTES = {
+    "/api/events/stream": "long-lived SSE stream",
+    "/api/events/ws": "long-lived WebSocket",
+    "/media": "static files from the local image backend",
+}
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    route: str
+    # (context, request number) -> httpx request kwargs plus "path"
+    build: Callable
+    auth: Optional[str] = None
+    ok: tuple = (200,)
+    # Rows to create in the database before this scenario runs
+    prepare: Optional[Callable] = None
+
+
+@dataclass
+class Context:
+    prefix: str
+    rng: random.Random
+    listing_ids: list
+    inquiry_ids: list
+    user_ids: list
+    tokens: dict = field(default_factory=dict)
+    prepared: dict = field(default_factory=dict)
+    users: dict = field(default_factory=dict)
+    dataset: dict = field(default_factory=dict)
+
+
+def _token(user: UserModel, kind: str = "access") -> str:
+    return user.generate_token() if kind == "access" else user.generate_refresh_token()
+
+
+def _listing_form(ctx: Context) -> dict:
+    listing = generate_listing(ctx.rng)
+    listing.pop("owner_id")
+    listing.pop("image_variants")
+    listing["images"] = json.dumps(listing["images"])
+    listing["notes"] = listing["notes"] or ""
+    return listing
+
+
+def _listing_update(ctx: Context) -> dict:
+    listing = generate_listing(ctx.rng)
+    listing.pop("owner_id")
+    listing.pop("image_variants")
+    return listing
+
+
+async def _prepare_listings(ctx: Context, count: int) -> list:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(insert(ListingModel).returning(ListingModel.id),
+                                  [generate_listing(ctx.rng) for _ in range(count)])
+        await db.commit()
+        return result.scalars().all()
+
+
+async def _prepare_inquiries(ctx: Context, count: int) -> list:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(insert(InquiryModel).returning(InquiryModel.id),
+                                  [generate_inquiry(ctx.rng, ctx.listing_ids, ctx.user_ids) for _ in range(count)])
+        await db.commit()
+        return result.scalars().all()
+
+
+async def _prepare_auctions(ctx: Context, count: int) -> list:
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(insert(AuctionModel).returning(AuctionModel.id), [
+            {
+                "listing_id": ctx.rng.choice(ctx.listing_ids), "starting_price": 10000, "min_increment": 100,
+                "starts_at": now - timedelta(minutes=1), "ends_at": now + timedelta(hours=6),
+                "status": "active", "bid_count": 0, "version": 0,
+            }
+            for _ in range(count)
+        ])
+        await db.commit()
+        return result.scalars().all()
+
+
+def scenarios() -> list:
+    def path_only(path):
+        return lambda ctx, i: {"path": path(ctx, i) if callable(path) else path}
+
+    def pick(ids):
+        return lambda ctx, i: ctx.rng.choice(getattr(ctx, ids))
+
+    listing_id = pick("listing_ids")
+    inquiry_id = pick("inquiry_ids")
+
+    async def one_auction(ctx, n):
+        return await _prepare_auctions(ctx, 1)
+
+    return [
+        Scenario("users.register", "POST", "/register", lambda ctx, i: {
+            "path": "/register",
+            "json": {"username": f"{ctx.prefix}_reg_{i}", "email": f"{ctx.prefix}_reg_{i}@example.com",
+                     "password": DEFAULT_PASSWORD},
+        }, ok=RATE_LIMITED),
+        Scenario("users.login", "POST", "/login", lambda ctx, i: {
+            "path": "/login", "json": {"username": ctx.users["user"].username, "password": DEFAULT_PASSWORD},
+        }, ok=RATE_LIMITED),
+        # Refresh and logout revoke the token they use, so each request gets a fresh one
+        Scenario("users.refresh", "POST", "/refresh", lambda ctx, i: {
+            "path": "/refresh", "json": {"refresh_token": _token(ctx.users["user"], "refresh")},
+        }),
+        Scenario("users.logout", "POST", "/logout", lambda ctx, i: {
+            "path": "/logout", "headers": {"Authorization": f"Bearer {_token(ctx.users['user'])}"},
+        }),
+        Scenario("listings.list", "GET", "/api/listings/", lambda ctx, i: {
+            "path": "/api/listings/",
+            "params": {"sort": ctx.rng.choice(["-created_at", "price", "-price"]), "limit": 50},
+        }),
+        Scenario("listings.list_sparse", "GET", "/api/listings/", lambda ctx, i: {
+            "path": "/api/listings/", "params": {"fields": "id,make,price,images", "limit": 100},
+        }),
+        Scenario("listings.search", "GET", "/api/listings/search", lambda ctx, i: {
+            "path": "/api/listings/search",
+            "params": {"q": ctx.rng.choice(["toyota", "black leather", "porsche gcc", "single owner"])},
+        }),
+        Scenario("listings.facets", "GET", "/api/listings/facets", path_only("/api/listings/facets")),
+        Scenario("listings.facets_filtered", "GET", "/api/listings/facets", lambda ctx, i: {
+            "path": "/api/listings/facets", "params": {"status": "Available", "min_year": 2015 + i % 10},
+        }),
+        Scenario("listings.get", "GET", "/api/listings/{listing_id}",
+                 path_only(lambda ctx, i: f"/api/listings/{listing_id(ctx, i)}")),
+        Scenario("listings.create", "POST", "/api/listings/", lambda ctx, i: {
+            "path": "/api/listings/", "data": _listing_form(ctx),
+        }, auth="admin"),
+        Scenario("listings.update", "PUT", "/api/listings/{listing_id}", lambda ctx, i: {
+            "path": f"/api/listings/{ctx.prepared['listings.update'][i]}", "json": _listing_update(ctx),
+        }, auth="admin", prepare=_prepare_listings),
+        Scenario("listings.patch", "PATCH", "/api/listings/{listing_id}", lambda ctx, i: {
+            "path": f"/api/listings/{ctx.prepared['listings.patch'][i]}",
+            "json": {"price": float(ctx.rng.randrange(20_000, 400_000, 500))},
+        }, auth="admin", prepare=_prepare_listings),
+        Scenario("listings.delete", "DELETE", "/api/listings/{listing_id}",
+                 path_only(lambda ctx, i: f"/api/listings/{ctx.prepared['listings.delete'][i]}"),
+                 auth="admin", prepare=_prepare_listings),
+        Scenario("inquiries.create", "POST", "/api/inquiries/", lambda ctx, i: {
+            "path": "/api/inquiries/",
+            "json": {k: v for k, v in generate_inquiry(ctx.rng, ctx.listing_ids, []).items()
+                     if k in ("listing_id", "full_name", "phone_number", "message")},
+        }, auth="user", ok=RATE_LIMITED),
+        Scenario("inquiries.list", "GET", "/api/inquiries/", lambda ctx, i: {
+            "path": "/api/inquiries/", "params": {"include": "listing,user", "limit": 50},
+        }, auth="admin"),
+        Scenario("inquiries.by_listing", "GET", "/api/inquiries/listing/{listing_id}",
+                 path_only(lambda ctx, i: f"/api/inquiries/listing/{listing_id(ctx, i)}"), auth="admin"),
+        Scenario("inquiries.update", "PUT", "/api/inquiries/{inquiry_id}", lambda ctx, i: {
+            "path": f"/api/inquiries/{inquiry_id(ctx, i)}", "json": {"message": f"Updated message {i}"},
+        }, auth="admin"),
+        Scenario("inquiries.delete", "DELETE", "/api/inquiries/{inquiry_id}",
+                 path_only(lambda ctx, i: f"/api/inquiries/{ctx.prepared['inquiries.delete'][i]}"),
+                 auth="admin", prepare=_prepare_inquiries),
+        Scenario("auctions.create", "POST", "/api/auctions/", lambda ctx, i: {
+            "path": "/api/auctions/",
+            "json": {
+                "listing_id": listing_id(ctx, i), "starting_price": 10000, "min_increment": 100,
+                "starts_at": datetime.now(timezone.utc).isoformat(),
+                "ends_at": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+            },
+        }, auth="admin"),
+        Scenario("auctions.list", "GET", "/api/auctions/", path_only("/api/auctions/")),
+        Scenario("auctions.get", "GET", "/api/auctions/{auction_id}",
+                 path_only(lambda ctx, i: f"/api/auctions/{ctx.prepared['auctions.get'][0]}"), prepare=one_auction),
+        Scenario("auctions.highest", "GET", "/api/auctions/{auction_id}/highest",
+                 path_only(lambda ctx, i: f"/api/auctions/{ctx.prepared['auctions.highest'][0]}"), prepare=one_auction),
+        # One hot auction; concurrent bids arrive out of order, so 409s are expected
+        Scenario("auctions.bid", "POST", "/api/auctions/{auction_id}/bids", lambda ctx, i: {
+            "path": f"/api/auctions/{ctx.prepared['auctions.bid'][0]}/bids",
+            "json": {"amount": 10000 + (i + 1) * 100},
+        }, auth="user", ok=(200, 409), prepare=one_auction),
+        Scenario("auctions.bids", "GET", "/api/auctions/{auction_id}/bids",
+                 path_only(lambda ctx, i: f"/api/auctions/{ctx.prepared['auctions.bids'][0]}/bids"),
+                 auth="admin", prepare=one_auction),
+        Scenario("auctions.cancel", "POST", "/api/auctions/{auction_id}/cancel",
+                 path_only(lambda ctx, i: f"/api/auctions/{ctx.prepared['auctions.cancel'][i]}/cancel"),
+                 auth="admin", prepare=_prepare_auctions),
+        Scenario("admin.pool", "GET", "/api/admin/pool", path_only("/api/admin/pool"), auth="admin"),
+        Scenario("admin.rebuild_facets", "POST", "/api/admin/listings/facets/rebuild",
+                 path_only("/api/admin/listings/facets/rebuild"), auth="admin"),
+        Scenario("admin.import", "POST", "/api/admin/listings/import", lambda ctx, i: {
+            "path": "/api/admin/listings/import",
+            "content": "".join(json.dumps(_listing_update(ctx)) + "\n" for _ in range(100)).encode(),
+            "headers": {"Content-Type": "application/x-ndjson"},
+        }, auth="admin"),
+        Scenario("admin.export_inquiries", "GET", "/api/admin/inquiries/export", lambda ctx, i: {
+            "path": "/api/admin/inquiries/export",
+            "params": {"format": "ndjson", "since": (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()},
+        }, auth="admin"),
+        Scenario("admin.export_listings", "GET", "/api/admin/listings/export", lambda ctx, i: {
+            "path": "/api/admin/listings/export",
+            "params": {"since": (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()},
+        }, auth="admin"),
+        Scenario("metrics", "GET", "/metrics", path_only("/metrics")),
+        Scenario("ready", "GET", "/ready", path_only("/ready")),
+        # Also answers GET / (the users router is included before the home route)
+        Scenario("users.list", "GET", "/", path_only("/")),
+    ]
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    # Nearest-rank
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: Context, scenario: Scenario, requests: int, concurrency: int):
+    if scenario.prepare:
+        ctx.prepared[scenario.name] = await scenario.prepare(ctx, requests)
+
+    latencies, statuses, failures = [], {}, 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, failures
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            kwargs = scenario.build(ctx, i)
+            path = kwargs.pop("path")
+            if scenario.auth:
+                kwargs.setdefault("headers", {})["Authorization"] = f"Bearer {ctx.tokens[scenario.auth]}"
+            started = time.perf_counter()
+            try:
+                response = await client.request(scenario.method, path, **kwargs)
+                await response.aread()
+                code = response.status_code
+            except httpx.HTTPError as e:
+                code = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[str(code)] = statuses.get(str(code), 0) + 1
+            if code not in scenario.ok:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda seconds: round(seconds * 1000, 2)
+    return {
+        "method": scenario.method,
+        "route": scenario.route,
+        "requests": requests,
+        "failures": failures,
+        "statuses": statuses,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p90_ms": ms(percentile(latencies, 0.90)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "max_ms": ms(latencies[-1]) if latencies else 0.0,
+    }
+
+
+def uncovered_routes(covered: set) -> list:
+    # Catches routes added without a scenario
+    from main import app
+
+    missing = []
+    for route in app.routes:
+        path = getattr(route, "path", "")
+        methods = getattr(route, "methods", None) or {"WEBSOCKET"}
+        for method in methods - {"HEAD", "OPTIONS"}:
+            if (method, path) not in covered and path not in SKIPPED_ROUTES \
+                    and not path.startswith(("/docs", "/redoc", "/openapi")):
+                missing.append(f"{method} {path}")
+    return sorted(missing)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def build_context(seed: int) -> Context:
+    prefix = f"load_{uuid.uuid4().hex[:6]}"
+    ctx = Context(prefix=prefix, rng=random.Random(seed), listing_ids=[], inquiry_ids=[], user_ids=[])
+    for role in ("admin", "user"):
+        username = f"loadtest_{role}"
+        user_id = await ensure_user(username, role)
+        ctx.users[role] = UserModel(id=user_id, username=username, role=role)
+        ctx.tokens[role] = _token(ctx.users[role])
+
+    # A random sample of existing rows to read and update
+    async with AsyncSessionLocal() as db:
+        for attr, column in (("listing_ids", ListingModel.id), ("inquiry_ids", InquiryModel.id), ("user_ids", UserModel.id)):
+            ids = (await db.execute(select(column).order_by(func.random()).limit(5000))).scalars().all()
+            setattr(ctx, attr, list(ids))
+        dataset = {
+            "users": await db.scalar(select(func.count()).select_from(UserModel)),
+            "listings": await db.scalar(select(func.count()).select_from(ListingModel)),
+            "inquiries": await db.scalar(select(func.count()).select_from(InquiryModel)),
+        }
+    if not ctx.listing_ids or not ctx.inquiry_ids:
+        raise SystemExit("No listings or inquiries to test against; run with --generate first")
+    ctx.dataset = dataset
+    return ctx
+
+
+async def main(args):
+    if args.generate:
+        summary = await synthetic_data.generate(args.users, args.listings, args.inquiries, args.seed)
+        print(f"generated {summary['users']} users, {summary['listings']} listings, {summary['inquiries']} inquiries")
+
+    ctx = await build_context(args.seed)
+    selected = [s for s in scenarios() if not args.only or any(s.name.startswith(name) for name in args.only)]
+
+    results = {}
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        for scenario in selected:
+            results[scenario.name] = await run_scenario(client, ctx, scenario, args.requests, args.concurrency)
+            r = results[scenario.name]
+            print(f"{scenario.name:<26} {r['throughput_rps']:>8} req/s  p50 {r['p50_ms']:>8} ms  "
+                  f"p99 {r['p99_ms']:>8} ms  failures {r['failures']}")
+    await async_engine.dispose()
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "git_revision": _git_revision(),
+            "base_url": args.base_url,
+            "requests_per_endpoint": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "dataset": ctx.dataset,
+        "endpoints": results,
+        "skipped": SKIPPED_ROUTES,
+        "uncovered": uncovered_routes({(s.method, s.route) for s in scenarios()}),
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"results written to {args.out}")
+    return 1 if any(r["failures"] for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aurevia API load test")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--out", default="load_test_results.json")
+    parser.add_argument("--only", nargs="*", help="Scenario name prefixes, e.g. listings auctions.bid")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--generate", action="store_true", help="Generate a synthetic dataset first")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--listings", type=int, default=50000)
+    parser.add_argument("--inquiries", type=int, default=20000)
+    raise SystemExit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,208 @@
+# scripts/seed.py
+#
+# Idempotent database seeding; safe to re-run. Users are upserted by
+# username, and synthetic rows are only topped up to the requested scale.
+# The schema itself comes from `alembic upgrade head`.
+#
+#   python -m scripts.seed demo                       # admin/admin123, aliqa/user123 and the test users
+#   python -m scripts.seed synthetic --scale 32       # ~1M rows (32k users, 320k listings, 640k inquiries)
+#   python -m scripts.seed reset --yes                # empty every table, keep the schema
+#
+# SQLAlchemy, the models and passlib are imported inside the subcommands, so
+# --help and argument errors return immediately.
+
+import argparse
+import asyncio
+import sys
+
+# Rows per unit of --scale
+SCALE_UNITS = {"users": 1000, "listings": 10000, "inquiries": 20000}
+BATCH_SIZE = 10000
+
+
+def hash_distinct(passwords) -> dict:
+    # bcrypt is slow by design: hash each distinct password once, in parallel
+    from concurrent.futures import ProcessPoolExecutor
+    from utils.passwords import hash_password
+
+    distinct = sorted(set(passwords))
+    if not distinct:
+        return {}
+    with ProcessPoolExecutor(max_workers=min(len(distinct), 8)) as pool:
+        return dict(zip(distinct, pool.map(hash_password, distinct)))
+
+
+async def bulk_insert(conn, table, rows, use_copy: bool):
+    if use_copy:
+        # COPY skips SQLAlchemy's Python-side defaults, so fill the timestamps here
+        import json
+        from datetime import datetime, timezone
+        from sqlalchemy.dialects.postgresql import JSONB
+
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for column in ("created_at", "updated_at"):
+            if column in table.c:
+                for row in rows:
+                    row.setdefault(column, now)
+        columns = list(rows[0])
+        # asyncpg's COPY takes json/jsonb values as text
+        for column in columns:
+            if isinstance(table.c[column].type, JSONB):
+                for row in rows:
+                    row[column] = json.dumps(row[column])
+        raw = (await conn.get_raw_connection()).driver_connection
+        await raw.copy_records_to_table(
+            table.name, columns=columns, records=[tuple(row[c] for c in columns) for row in rows]
+        )
+    else:
+        from sqlalchemy import insert
+
+        await conn.execute(insert(table), rows)
+
+
+async def seed_demo(args):
+    from sqlalchemy import select
+    from sqlalchemy.dialects.postgresql import insert
+    from database import async_engine
+    from models.user import UserModel
+    from data.user_data import DEMO_ACCOUNTS, TEST_USERS
+
+    accounts = DEMO_ACCOUNTS + TEST_USERS
+    async with async_engine.connect() as conn:
+        existing = set((await conn.execute(
+            select(UserModel.username).where(UserModel.username.in_([a["username"] for a in accounts]))
+        )).scalars())
+        # Existing accounts keep their password unless asked, so re-runs do no bcrypt work
+        pending = accounts if args.reset_passwords else [a for a in accounts if a["username"] not in existing]
+        hashes = hash_distinct(a["password"] for a in pending)
+
+        if pending:
+            stmt = insert(UserModel.__table__).values([
+                {"username": a["username"], "email": a["email"], "role": a["role"],
+                 "password_hash": hashes[a["password"]]}
+                for a in pending
+            ])
+            if args.reset_passwords:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["username"],
+                    set_={"password_hash": stmt.excluded.password_hash, "role": stmt.excluded.role}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing()
+            await conn.execute(stmt)
+            await conn.commit()
+    await async_engine.dispose()
+
+    print(f"demo accounts: {len(pending)} written, {len(accounts) - len(pending)} already present")
+    print("admin login: admin / admin123")
+
+
+async def _count(conn, model, *where):
+    from sqlalchemy import select, func
+
+    return await conn.scalar(select(func.count()).select_from(model).where(*where))
+
+
+async def seed_synthetic(args):
+    import random
+    import time
+    from sqlalchemy import select, func
+    from sqlalchemy.dialects.postgresql import insert
+    from database import async_engine, AsyncSessionLocal
+    from models.user import UserModel
+    from models.listing import ListingModel
+    from models.inquiry import InquiryModel
+    from services.listing_facets import rebuild_facets
+    from scripts.synthetic_data import generate_listing, generate_inquiry, DEFAULT_PASSWORD
+    from utils.passwords import hash_password
+
+    targets = {name: int(unit * args.scale) for name, unit in SCALE_UNITS.items()}
+    rng = random.Random(args.seed)
+    use_copy = args.method == "copy"
+    started = time.perf_counter()
+
+    async with async_engine.connect() as conn:
+        # Users have stable names, so re-runs upsert instead of duplicating
+        seeded = UserModel.username.like("seed\\_user\\_%")
+        have = await _count(conn, UserModel, seeded)
+        if have < targets["users"]:
+            password_hash = hash_password(DEFAULT_PASSWORD)
+            for start in range(have, targets["users"], BATCH_SIZE):
+                rows = [
+                    {"username": f"seed_user_{i}", "email": f"seed_user_{i}@example.com",
+                     "role": "user", "password_hash": password_hash}
+                    for i in range(start, min(start + BATCH_SIZE, targets["users"]))
+                ]
+                await conn.execute(insert(UserModel.__table__).on_conflict_do_nothing(), rows)
+                await conn.commit()
+        print(f"users: {max(targets['users'] - have, 0)} added ({time.perf_counter() - started:.1f}s)")
+
+        # Listings and inquiries have no natural key; top the tables up to the target
+        owner_id = await conn.scalar(select(UserModel.id).where(UserModel.role == "admin").limit(1))
+        have = await _count(conn, ListingModel)
+        for start in range(have, targets["listings"], BATCH_SIZE):
+            count = min(BATCH_SIZE, targets["listings"] - start)
+            await bulk_insert(conn, ListingModel.__table__, [generate_listing(rng, owner_id) for _ in range(count)], use_copy)
+            await conn.commit()
+        print(f"listings: {max(targets['listings'] - have, 0)} added ({time.perf_counter() - started:.1f}s)")
+
+        have = await _count(conn, InquiryModel)
+        if have < targets["inquiries"]:
+            # A sample is enough to spread inquiries; keeps memory flat at any scale
+            listing_ids = (await conn.execute(select(ListingModel.id).order_by(func.random()).limit(100000))).scalars().all()
+            user_ids = (await conn.execute(select(UserModel.id).where(seeded).limit(100000))).scalars().all()
+            for start in range(have, targets["inquiries"], BATCH_SIZE):
+                count = min(BATCH_SIZE, targets["inquiries"] - start)
+                await bulk_insert(conn, InquiryModel.__table__,
+                                  [generate_inquiry(rng, listing_ids, user_ids) for _ in range(count)], use_copy)
+                await conn.commit()
+        print(f"inquiries: {max(targets['inquiries'] - have, 0)} added ({time.perf_counter() - started:.1f}s)")
+
+    # Bulk loads bypass the per-write facet updates, so recount once at the end
+    async with AsyncSessionLocal() as db:
+        await rebuild_facets(db)
+        await db.commit()
+    await async_engine.dispose()
+
+
+async def reset(args):
+    if not args.yes:
+        sys.exit("Refusing to empty the database without --yes")
+    from sqlalchemy import text
+    from database import async_engine
+    from models.base import Base
+    import models  # noqa: F401  registers every table on Base.metadata
+
+    tables = ", ".join(table.name for table in Base.metadata.sorted_tables)
+    async with async_engine.begin() as conn:
+        await conn.execute(text(f"TRUNCATE {tables} RESTART IDENTITY CASCADE"))
+    await async_engine.dispose()
+    print(f"emptied: {tables}")
+
+
+COMMANDS = {"demo": seed_demo, "synthetic": seed_synthetic, "reset": reset}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the Aurevia database")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    demo = subcommands.add_parser("demo", help="Demo and test accounts")
+    demo.add_argument("--reset-passwords", action="store_true", help="Rewrite passwords of existing demo accounts")
+
+    synthetic = subcommands.add_parser("synthetic", help="Synthetic users, listings and inquiries")
+    synthetic.add_argument("--scale", type=float, default=1.0,
+                           help="Multiplier of 1k users, 10k listings, 20k inquiries (table totals)")
+    synthetic.add_argument("--seed", type=int, default=0)
+    synthetic.add_argument("--method", choices=["copy", "insert"], default="copy",
+                           help="COPY via asyncpg (fastest) or batched multi-row INSERT")
+
+    wipe = subcommands.add_parser("reset", help="Empty every table")
+    wipe.add_argument("--yes", action="store_true")
+
+    args = parser.parse_args(argv)
+    asyncio.run(COMMANDS[args.command](args))
+
+
+if __name__ == "__main__":
+    main()
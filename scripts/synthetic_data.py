@@ -0,0 +1,180 @@
+# scripts/synthetic_data.py
+#
+# Generates a reproducible synthetic dataset (users, listings, inquiries) and
+# bulk-inserts it into the configured database. Used by scripts.load_test.
+#
+#   python -m scripts.synthetic_data --users 1000 --listings 50000 --inquiries 20000 --seed 7 --allow-writes
+#
+# Every generated user shares one password (hashed once), so datasets of any
+# size are quick to create; rows are inserted in batches with executemany.
+# The command line refuses to write without --allow-writes, since it targets
+# whatever DB_URI points at.
+
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, insert
+from database import AsyncSessionLocal, async_engine
+from models.user import UserModel
+from models.listing import ListingModel
+from models.inquiry import InquiryModel
+from services.image_pipeline import VARIANT_SIZES
+from services.listing_facets import rebuild_facets
+from utils.passwords import hash_password
+
+DEFAULT_PASSWORD = "synthetic-password"
+BATCH_SIZE = 5000
+
+# make: (new price in USD, share of listings)
+MAKES = {
+    "Toyota": (55000, 18), "Nissan": (48000, 12), "Lexus": (85000, 8), "Mercedes-Benz": (110000, 10),
+    "BMW": (95000, 9), "Porsche": (140000, 5), "Land Rover": (120000, 7), "Ford": (52000, 8),
+    "Chevrolet": (50000, 6), "Audi": (80000, 6), "Ferrari": (320000, 1), "Rolls-Royce": (450000, 1),
+    "Hyundai": (32000, 5), "Kia": (30000, 4),
+}
+SPECS = ["GCC", "GCC", "GCC", "US", "EU"]
+COLORS = ["White", "Black", "Silver", "Grey", "Blue", "Red", "Beige", "Green", "Brown"]
+INTERIORS = ["Black Leather", "Beige Leather", "Red Leather", "Grey Fabric", "Tan Alcantara"]
+NOTES = [
+    "Full service history", "Single owner", "Accident free", "Under warranty",
+    "Recently serviced", "Ceramic coated", "Panoramic roof", None, None,
+]
+FIRST_NAMES = ["Aisha", "Omar", "Lena", "Ravi", "Sofia", "Yusuf", "Mei", "Lucas", "Fatima", "Elena", "Arjun", "Noah"]
+LAST_NAMES = ["Khan", "Haddad", "Silva", "Popov", "Johnson", "Sharma", "Chen", "Ali", "Garcia", "Müller"]
+MESSAGES = [
+    "Is this still available?", "Can I book a test drive this weekend?", "What is your best price?",
+    "Do you offer financing?", "Can you share the service records?", "Is export paperwork included?",
+]
+
+
+def generate_users(count: int, rng: random.Random, prefix: str, password_hash: str):
+    return [
+        {
+            "username": f"{prefix}_user_{i}",
+            "email": f"{prefix}_user_{i}@example.com",
+            "password_hash": password_hash,
+            "role": "user",
+        }
+        for i in range(count)
+    ]
+
+
+# What the image pipeline stores for a source it cannot render. Synthetic image
+# URLs point nowhere, so rows start out "done" and the startup sweep skips them.
+def placeholder_variants(images) -> list:
+    return [{variant: url for variant in VARIANT_SIZES} for url in images]
+
+
+def generate_listing(rng: random.Random, owner_id=None, image_host: str = "https://images.example.com") -> dict:
+    make = rng.choices(list(MAKES), weights=[share for _, share in MAKES.values()])[0]
+    new_price = MAKES[make][0]
+    age = min(int(rng.expovariate(1 / 4)), 20)
+    mileage = max(0, int(age * rng.gauss(15000, 5000)))
+    # Roughly 12% depreciation a year, less for high mileage, with dealer noise
+    price = new_price * (0.88 ** age) * max(0.5, 1 - mileage / 600000) * rng.uniform(0.9, 1.1)
+    slug = uuid.UUID(int=rng.getrandbits(128)).hex[:12]
+    images = [f"{image_host}/{slug}/{n}.jpg" for n in range(rng.randint(1, 12))]
+    return {
+        "make": make,
+        "model_year": datetime.now().year - age,
+        "mileage": mileage,
+        "spec": rng.choice(SPECS),
+        "exterior": rng.choice(COLORS),
+        "interior": rng.choice(INTERIORS),
+        "price": round(price, -2),
+        "status": "Sold" if rng.random() < 0.15 else "Available",
+        "notes": rng.choice(NOTES),
+        "images": images,
+        "image_variants": placeholder_variants(images),
+        "owner_id": owner_id,
+    }
+
+
+def generate_inquiry(rng: random.Random, listing_ids, user_ids) -> dict:
+    return {
+        "listing_id": rng.choice(listing_ids),
+        "user_id": rng.choice(user_ids) if user_ids and rng.random() < 0.6 else None,
+        "full_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "phone_number": f"+9715{rng.randint(0, 99999999):08d}",
+        "message": rng.choice(MESSAGES),
+        # Spread over the last 90 days so since/until filters have something to cut
+        "created_at": datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(minutes=rng.randint(0, 90 * 24 * 60)),
+    }
+
+
+async def _insert_returning_ids(db, model, rows) -> list:
+    ids = []
+    for start in range(0, len(rows), BATCH_SIZE):
+        result = await db.execute(insert(model).returning(model.id), rows[start:start + BATCH_SIZE])
+        ids.extend(result.scalars().all())
+        await db.commit()
+    return ids
+
+
+async def ensure_user(username: str, role: str, password: str = DEFAULT_PASSWORD) -> int:
+    async with AsyncSessionLocal() as db:
+        user_id = await db.scalar(select(UserModel.id).where(UserModel.username == username))
+        if user_id is None:
+            user = UserModel(username=username, email=f"{username}@example.com", role=role,
+                             password_hash=hash_password(password))
+            db.add(user)
+            await db.commit()
+            user_id = user.id
+        return user_id
+
+
+async def generate(users: int, listings: int, inquiries: int, seed: int = 0, prefix: str = None) -> dict:
+    rng = random.Random(seed)
+    prefix = prefix or f"syn{seed}_{uuid.uuid4().hex[:6]}"
+    password_hash = hash_password(DEFAULT_PASSWORD)
+
+    async with AsyncSessionLocal() as db:
+        user_ids = await _insert_returning_ids(db, UserModel, generate_users(users, rng, prefix, password_hash))
+        owner_id = await db.scalar(select(UserModel.id).where(UserModel.role == "admin").limit(1))
+
+        listing_ids = []
+        # Generated per batch so memory stays flat for large counts
+        for start in range(0, listings, BATCH_SIZE):
+            batch = [generate_listing(rng, owner_id) for _ in range(min(BATCH_SIZE, listings - start))]
+            listing_ids.extend(await _insert_returning_ids(db, ListingModel, batch))
+
+        inquiry_count = 0
+        if listing_ids:
+            for start in range(0, inquiries, BATCH_SIZE):
+                batch = [generate_inquiry(rng, listing_ids, user_ids) for _ in range(min(BATCH_SIZE, inquiries - start))]
+                inquiry_count += len(await _insert_returning_ids(db, InquiryModel, batch))
+
+        # Bulk inserts bypass the per-write facet updates, so recount once at the end
+        await rebuild_facets(db)
+        await db.commit()
+
+    return {
+        "prefix": prefix,
+        "seed": seed,
+        "users": len(user_ids),
+        "listings": len(listing_ids),
+        "inquiries": inquiry_count,
+        "password": DEFAULT_PASSWORD,
+    }
+
+
+async def main(args):
+    if not args.allow_writes:
+        raise SystemExit("Refusing to write to the configured database without --allow-writes")
+    summary = await generate(args.users, args.listings, args.inquiries, args.seed, args.prefix)
+    await async_engine.dispose()
+    print(f"{summary['prefix']}: {summary['users']} users, {summary['listings']} listings, "
+          f"{summary['inquiries']} inquiries (password: {summary['password']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Aurevia dataset")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--listings", type=int, default=1000)
+    parser.add_argument("--inquiries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--prefix", default=None, help="Username prefix (defaults to a random one per run)")
+    parser.add_argument("--allow-writes", action="store_true", help="Insert into the database DB_URI points at")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,47 @@
+# serializers/auction.py
+
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class AuctionCreate(BaseModel):
+    listing_id: int
+    starting_price: float = Field(gt=0)
+    min_increment: float = Field(100, gt=0)
+    starts_at: datetime
+    ends_at: datetime
+
+class AuctionResponse(BaseModel):
+    id: int
+    listing_id: int
+    starting_price: float
+    min_increment: float
+    starts_at: datetime
+    ends_at: datetime
+    status: str
+    current_price: Optional[float] = None
+    highest_bidder_id: Optional[int] = None
+    bid_count: int
+
+    class Config:
+        from_attributes = True
+
+class BidCreate(BaseModel):
+    amount: float = Field(gt=0)
+
+class BidResponse(BaseModel):
+    id: int
+    auction_id: int
+    user_id: int
+    amount: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class HighestBid(BaseModel):
+    auction_id: int
+    current_price: Optional[float] = None
+    highest_bidder_id: Optional[int] = None
+    bid_count: int
+    minimum_next_bid: float
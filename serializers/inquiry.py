@@ -1,7 +1,7 @@
 # serializers/inquiry.py
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class InquiryCreate(BaseModel):
@@ -25,4 +25,31 @@ class InquiryResponse(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Compact summaries embedded in the admin inquiry list via ?include=
+class ListingSummary(BaseModel):
+    id: int
+    make: str
+    model_year: int
+    price: float
+    status: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class UserSummary(BaseModel):
+    id: int
+    username: str
+    email: str
+
+    class Config:
+        from_attributes = True
+
+class InquiryDetailResponse(InquiryResponse):
+    listing: Optional[ListingSummary] = None
+    user: Optional[UserSummary] = None
+
+class InquiryPage(BaseModel):
+    items: List[InquiryDetailResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
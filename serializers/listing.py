@@ -1,6 +1,12 @@
 from pydantic import BaseModel
 from typing import Optional, List, Literal
 
+# Resized copies of one image, built in the background by services/image_pipeline
+class ImageVariants(BaseModel):
+    thumbnail: str
+    card: str
+    full: str
+
 class ListingBase(BaseModel):
     make: str
     model_year: int
@@ -31,6 +37,7 @@ class ListingUpdate(BaseModel):
 class ListingResponse(ListingBase):
     id: int
     owner_id: int
+    image_variants: List[ImageVariants] = []
 
     class Config:
         from_attributes = True
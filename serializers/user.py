@@ -1,6 +1,7 @@
 # serializers/user.py
 
 from pydantic import BaseModel
+from typing import Optional
 
 class UserSchema(BaseModel):
     username: str  # User's unique name
@@ -26,6 +27,13 @@ class UserLogin(BaseModel):
 class UserToken(BaseModel):
     token: str  # JWT token generated upon successful login
     message: str  # Success message
+    refresh_token: Optional[str] = None  # Long-lived token exchanged at /refresh for a new access token
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None  # Also revoke this refresh token if provided
\ No newline at end of file
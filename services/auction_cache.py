@@ -0,0 +1,64 @@
+# services/auction_cache.py
+
+import time
+from datetime import datetime, timezone
+from config.environment import auction_cache_ttl_seconds
+
+
+class AuctionState:
+    __slots__ = ("auction_id", "starting_price", "min_increment", "starts_at", "ends_at", "status",
+                 "current_price", "highest_bidder_id", "bid_count", "version", "loaded_at")
+
+    def __init__(self, source):
+        # `source` is an AuctionModel or a RETURNING row with the same attribute names
+        self.auction_id = source.id
+        for name in self.__slots__[1:-1]:
+            setattr(self, name, getattr(source, name))
+        self.loaded_at = time.monotonic()
+
+    def minimum_next_bid(self) -> float:
+        if self.current_price is None:
+            return self.starting_price
+        return self.current_price + self.min_increment
+
+    def rejection_reason(self, amount: float, now: datetime = None):
+        now = now or datetime.now(timezone.utc)
+        if self.status != "active":
+            return "Auction has been cancelled"
+        if now < self.starts_at:
+            return "Auction has not started yet"
+        if now >= self.ends_at:
+            return "Auction has ended"
+        if amount < self.minimum_next_bid():
+            return f"Bid must be at least {self.minimum_next_bid():.2f}"
+        return None
+
+
+class HighestBidCache:
+    # Per-worker view of each auction's highest bid. Versions only move
+    # forward, so the cached price is never above the real one: a bid below
+    # it can be rejected without asking the database.
+
+    def __init__(self, ttl_seconds: float = auction_cache_ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._states = {}
+
+    def get(self, auction_id: int, fresh_only: bool = False):
+        state = self._states.get(auction_id)
+        if state and fresh_only and time.monotonic() - state.loaded_at > self.ttl_seconds:
+            return None
+        return state
+
+    def store(self, source) -> AuctionState:
+        state = AuctionState(source)
+        current = self._states.get(state.auction_id)
+        if current is None or state.version >= current.version:
+            self._states[state.auction_id] = state
+            return state
+        return current
+
+    def discard(self, auction_id: int):
+        self._states.pop(auction_id, None)
+
+
+highest_bids = HighestBidCache()
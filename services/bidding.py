@@ -0,0 +1,85 @@
+# services/bidding.py
+
+from sqlalchemy import update, insert, and_, or_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.auction import AuctionModel, BidModel
+from services.auction_cache import highest_bids
+
+
+class BidRejected(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AuctionNotFound(Exception):
+    pass
+
+
+AUCTION_STATE_COLUMNS = [
+    AuctionModel.id, AuctionModel.starting_price, AuctionModel.min_increment,
+    AuctionModel.starts_at, AuctionModel.ends_at, AuctionModel.status,
+    AuctionModel.current_price, AuctionModel.highest_bidder_id,
+    AuctionModel.bid_count, AuctionModel.version,
+]
+
+
+async def load_state(auction_id: int, db: AsyncSession):
+    auction = await db.get(AuctionModel, auction_id, populate_existing=True)
+    if not auction:
+        raise AuctionNotFound(auction_id)
+    return highest_bids.store(auction)
+
+
+async def place_bid(db: AsyncSession, auction_id: int, user_id: int, amount: float) -> BidModel:
+    # Fast rejection: the cached price never exceeds the real one, so a bid that
+    # loses against the cache would lose against the database too
+    cached = highest_bids.get(auction_id)
+    if cached:
+        reason = cached.rejection_reason(amount)
+        if reason:
+            raise BidRejected(reason)
+
+    # Accept the bid only if it still beats the current price. The UPDATE takes
+    # the auction's row lock, so concurrent bidders are applied one at a time and
+    # each re-checks the condition against the latest committed price.
+    accept = (
+        update(AuctionModel)
+        .where(
+            AuctionModel.id == auction_id,
+            AuctionModel.status == "active",
+            AuctionModel.starts_at <= func.now(),
+            AuctionModel.ends_at > func.now(),
+            or_(
+                and_(AuctionModel.current_price.is_(None), AuctionModel.starting_price <= amount),
+                AuctionModel.current_price + AuctionModel.min_increment <= amount,
+            )
+        )
+        .values(
+            current_price=amount,
+            highest_bidder_id=user_id,
+            bid_count=AuctionModel.bid_count + 1,
+            version=AuctionModel.version + 1,
+            updated_at=func.now()
+        )
+        .returning(*AUCTION_STATE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    accepted = (await db.execute(accept)).first()
+
+    if accepted is None:
+        await db.rollback()
+        # Outbid (or closed) since our cache was loaded; refresh it and explain why
+        state = await load_state(auction_id, db)
+        raise BidRejected(state.rejection_reason(amount) or "Bid was outbid, please retry")
+
+    # Recorded in the same transaction, so the row lock also orders the bid history
+    bid = await db.scalar(
+        insert(BidModel)
+        .values(auction_id=auction_id, user_id=user_id, amount=amount)
+        .returning(BidModel)
+    )
+    await db.commit()
+
+    highest_bids.store(accepted)
+    return bid
@@ -0,0 +1,82 @@
+# services/denylist.py
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import AsyncSessionLocal
+from models.revoked_token import RevokedTokenModel
+from utils.bloom import BloomFilter
+from config.environment import denylist_sync_seconds
+
+
+class TokenDenylist:
+    # In-memory Bloom filter over revoked token ids (jti), rebuilt from the
+    # revoked_tokens table every `sync_seconds`. A miss means "not revoked"
+    # without touching the database; a hit is confirmed against the table.
+
+    def __init__(self, sync_seconds: int = denylist_sync_seconds, capacity: int = 10000):
+        self.sync_seconds = sync_seconds
+        self.capacity = capacity
+        self._filter = BloomFilter(capacity)
+        self._synced_at = None
+        self._lock = asyncio.Lock()
+
+    async def sync(self):
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(RevokedTokenModel.jti).where(RevokedTokenModel.expires_at > now)
+            )
+            jtis = result.scalars().all()
+
+        bloom = BloomFilter(max(self.capacity, len(jtis) * 2))
+        for jti in jtis:
+            bloom.add(jti)
+        self._filter = bloom
+        self._synced_at = time.monotonic()
+
+    def _is_stale(self) -> bool:
+        return self._synced_at is None or time.monotonic() - self._synced_at >= self.sync_seconds
+
+    async def _maybe_sync(self):
+        if not self._is_stale():
+            return
+        # Only one request reloads; the others keep using the current filter,
+        # except before the first load, when there is nothing to use yet
+        if self._lock.locked() and self._synced_at is not None:
+            return
+        async with self._lock:
+            if self._is_stale():
+                await self.sync()
+
+    async def is_revoked(self, jti: str, db: AsyncSession) -> bool:
+        if not jti:
+            return False
+        await self._maybe_sync()
+        if jti not in self._filter:
+            return False
+        # Possible false positive, so check the table
+        result = await db.execute(
+            select(RevokedTokenModel.id).where(RevokedTokenModel.jti == jti)
+        )
+        return result.first() is not None
+
+    # Returns False when the jti was already revoked, so of two concurrent
+    # requests presenting the same token only one gets True
+    async def revoke(self, jti: str, expires_at: datetime, db: AsyncSession) -> bool:
+        result = await db.execute(
+            pg_insert(RevokedTokenModel)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["jti"])
+            .returning(RevokedTokenModel.jti)
+        )
+        inserted = result.first() is not None
+        await db.commit()
+        self._filter.add(jti)
+        return inserted
+
+
+denylist = TokenDenylist()
@@ -0,0 +1,146 @@
+# services/events.py
+#
+# Publish/subscribe for listing and inquiry changes, pushed to clients over
+# SSE and WebSocket by controllers/events.py.
+
+import asyncio
+import json
+import logging
+from sqlalchemy.engine import make_url
+from config.environment import db_URI, event_broker_backend, event_subscriber_queue_size
+
+logger = logging.getLogger(__name__)
+
+TOPICS = ("listings", "inquiries")
+
+
+class Subscription:
+
+    def __init__(self, topics, queue_size: int):
+        self.topics = set(topics)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        # Set when the client fell too far behind; it should reconnect and refetch
+        self.overflowed = False
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InProcessBroker:
+    # Fans events out to the subscribers of this worker only
+
+    def __init__(self, queue_size: int = event_subscriber_queue_size):
+        self.queue_size = queue_size
+        self._subscribers = {topic: set() for topic in TOPICS}
+        self._listeners = {topic: [] for topic in TOPICS}
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def subscribe(self, topics) -> Subscription:
+        subscription = Subscription(topics, self.queue_size)
+        for topic in subscription.topics:
+            self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for topic in subscription.topics:
+            self._subscribers[topic].discard(subscription)
+
+    def subscriber_count(self) -> int:
+        return len(set().union(*self._subscribers.values()))
+
+    def add_listener(self, topic: str, callback):
+        # In-process callbacks (e.g. cache invalidation), called for every event on `topic`
+        self._listeners[topic].append(callback)
+
+    def deliver(self, topic: str, message: str):
+        # The event is serialized once and the same string goes to every subscriber
+        for callback in self._listeners[topic]:
+            try:
+                callback(message)
+            except Exception:
+                logger.exception("Event listener failed", extra={"topic": topic})
+        for subscription in list(self._subscribers[topic]):
+            try:
+                subscription.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                subscription.overflowed = True
+                self.unsubscribe(subscription)
+
+    async def publish(self, topic: str, event: dict):
+        self.deliver(topic, json.dumps({"topic": topic, **event}, default=str))
+
+
+class PostgresBroker(InProcessBroker):
+    # Events go through Postgres NOTIFY, and every worker LISTENs, so all
+    # subscribers see the same stream whichever worker handled the write
+
+    CHANNEL_PREFIX = "aurevia_"
+
+    def __init__(self, queue_size: int = event_subscriber_queue_size):
+        super().__init__(queue_size)
+        # asyncpg takes a plain postgresql:// DSN
+        self.dsn = make_url(db_URI).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._connection = None
+        self._supervisor = None
+
+    async def start(self):
+        self._supervisor = asyncio.create_task(self._listen_forever())
+
+    async def stop(self):
+        if self._supervisor:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+        if self._connection and not self._connection.is_closed():
+            await self._connection.close()
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.deliver(channel[len(self.CHANNEL_PREFIX):], payload)
+
+    async def _listen_forever(self):
+        import asyncpg
+
+        delay = 1
+        while True:
+            try:
+                self._connection = await asyncpg.connect(self.dsn)
+                for topic in TOPICS:
+                    await self._connection.add_listener(self.CHANNEL_PREFIX + topic, self._on_notify)
+                delay = 1
+                while not self._connection.is_closed():
+                    await asyncio.sleep(5)
+                logger.warning("Event listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event listener failed, retrying", extra={"retry_in": delay})
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    async def publish(self, topic: str, event: dict):
+        from sqlalchemy import text
+        from database import async_engine
+
+        payload = json.dumps({"topic": topic, **event}, default=str)
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT pg_notify(:channel, :payload)"),
+                               {"channel": self.CHANNEL_PREFIX + topic, "payload": payload})
+            await conn.commit()
+
+
+event_broker = PostgresBroker() if event_broker_backend == "postgres" else InProcessBroker()
+
+
+# Used by write handlers; a broker failure must not fail the write that already committed
+async def publish_event(topic: str, event_type: str, **fields):
+    try:
+        await event_broker.publish(topic, {"type": event_type, **fields})
+    except Exception:
+        logger.exception("Event publish failed", extra={"topic": topic, "event_type": event_type})
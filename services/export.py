@@ -0,0 +1,75 @@
+# services/export.py
+#
+# Streams table rows as CSV or NDJSON from a server-side cursor. Rows are
+# plain Core tuples (no ORM objects) and are encoded a chunk at a time, so a
+# worker's memory use does not depend on the table size.
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from database import async_engine
+from models.listing import ListingModel
+from models.inquiry import InquiryModel
+from utils.pagination import naive_utc
+from config.environment import export_chunk_rows, export_statement_timeout_ms, export_idle_timeout_ms
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# search_vector is derived data and not worth shipping
+LISTING_EXPORT_COLUMNS = [column for column in ListingModel.__table__.c if column.name != "search_vector"]
+INQUIRY_EXPORT_COLUMNS = list(InquiryModel.__table__.c)
+
+
+def _csv_value(value):
+    # Lists as JSON arrays, the same form the listing import accepts
+    if isinstance(value, list):
+        return json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(names, rows, include_header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if include_header:
+        writer.writerow(names)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+    return buffer.getvalue()
+
+
+def _encode_ndjson(names, rows) -> str:
+    return "".join(json.dumps(dict(zip(names, row)), default=str) + "\n" for row in rows)
+
+
+async def stream_export(columns, fmt: str, since: Optional[datetime] = None,
+                        chunk_rows: int = export_chunk_rows):
+    names = [column.name for column in columns]
+    table = columns[0].table
+    query = select(*columns).order_by(table.c.id)
+    if since is not None:
+        query = query.where(table.c.created_at >= naive_utc(since))
+
+    # The request's session is closed before a streamed body is sent, so the
+    # export holds its own connection for as long as the client is reading
+    async with async_engine.connect() as conn:
+        # The cursor's transaction stays open while a slow client reads, which the
+        # pool-wide timeouts would kill mid-body; these are longer but still finite,
+        # and SET LOCAL ends with this transaction
+        await conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(export_statement_timeout_ms)}")
+        await conn.exec_driver_sql(f"SET LOCAL idle_in_transaction_session_timeout = {int(export_idle_timeout_ms)}")
+        result = await conn.stream(query.execution_options(yield_per=chunk_rows))
+        first = True
+        async for rows in result.partitions():
+            if fmt == "csv":
+                yield _encode_csv(names, rows, include_header=first)
+            else:
+                yield _encode_ndjson(names, rows)
+            first = False
+        if first and fmt == "csv":
+            # Empty export still gets a header row
+            yield _encode_csv(names, [], include_header=True)
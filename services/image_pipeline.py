@@ -0,0 +1,275 @@
+# services/image_pipeline.py
+#
+# Builds thumbnail/card/full variants for listing images in the background
+# and stores their URLs in listings.image_variants, so list views can load
+# small images. Requests only enqueue work; rendering runs in worker tasks
+# (blocking I/O and resizing in threads), never on the request path.
+
+import asyncio
+import hashlib
+import http.client
+import io
+import ipaddress
+import logging
+import os
+import urllib.request
+from urllib.parse import urlsplit
+from sqlalchemy import select, update, func
+from sqlalchemy.engine import make_url
+from database import AsyncSessionLocal
+from models.listing import ListingModel
+from services.response_cache import response_cache
+from services.events import publish_event
+from config.environment import db_URI, image_backend, media_root, media_url, image_workers
+
+logger = logging.getLogger(__name__)
+
+# Bounding boxes; aspect ratio is kept
+VARIANT_SIZES = {
+    "thumbnail": (160, 120),
+    "card": (480, 360),
+    "full": (1600, 1200),
+}
+
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+
+# Rendered listings written per transaction, and the longest a result waits for its batch
+STORE_BATCH_SIZE = 50
+STORE_BATCH_SECONDS = 2.0
+# pg_try_advisory_lock key held by the one worker running the startup sweep
+SWEEP_LOCK_KEY = 7140317
+# Listings the sweep queues at a time; the next page waits until these are rendered
+SWEEP_PAGE_SIZE = 500
+
+
+# Source URLs come from admins and imports, so downloads are limited to public
+# http(s) hosts. The check runs on the address actually connected to (after DNS
+# and on every redirect), so a hostname cannot resolve to an internal service.
+def _check_peer(sock):
+    address = ipaddress.ip_address(sock.getpeername()[0].split("%")[0])
+    if address.version == 6 and address.ipv4_mapped:
+        address = address.ipv4_mapped
+    if not address.is_global:
+        sock.close()
+        raise ValueError(f"Refusing to fetch from non-public address {address}")
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def connect(self):
+        super().connect()
+        _check_peer(self.sock)
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    def connect(self):
+        super().connect()
+        _check_peer(self.sock)
+
+
+class _PublicHTTPHandler(urllib.request.HTTPHandler):
+    def http_open(self, req):
+        return self.do_open(_PublicHTTPConnection, req)
+
+
+class _PublicHTTPSHandler(urllib.request.HTTPSHandler):
+    def https_open(self, req):
+        return self.do_open(_PublicHTTPSConnection, req, context=self._context)
+
+
+def _build_opener():
+    # No file:, ftp:, data: or proxy handlers, unlike urllib.request.build_opener()
+    opener = urllib.request.OpenerDirector()
+    for handler in (_PublicHTTPHandler(), _PublicHTTPSHandler(), urllib.request.HTTPRedirectHandler(),
+                    urllib.request.HTTPDefaultErrorHandler(), urllib.request.HTTPErrorProcessor()):
+        opener.add_handler(handler)
+    return opener
+
+
+_opener = _build_opener()
+
+
+def fetch_source(source_url: str) -> bytes:
+    if urlsplit(source_url).scheme not in ("http", "https"):
+        raise ValueError("Only http and https image URLs are fetched")
+    with _opener.open(source_url, timeout=10) as response:
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > MAX_SOURCE_BYTES:
+            raise ValueError("Source image too large")
+        data = response.read(MAX_SOURCE_BYTES + 1)
+    if len(data) > MAX_SOURCE_BYTES:
+        raise ValueError("Source image too large")
+    return data
+
+
+class LocalImageBackend:
+    # Filesystem stand-in for the CDN: downloads the source once, writes WebP
+    # variants named after a hash of its URL, and skips work already on disk
+
+    def __init__(self, root: str = media_root, url_prefix: str = media_url):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip("/")
+        os.makedirs(root, exist_ok=True)
+
+    def render(self, source_url: str) -> dict:
+        key = hashlib.sha1(source_url.encode()).hexdigest()[:20]
+        names = {variant: f"{key}_{variant}.webp" for variant in VARIANT_SIZES}
+        urls = {variant: f"{self.url_prefix}/{name}" for variant, name in names.items()}
+        if all(os.path.exists(os.path.join(self.root, name)) for name in names.values()):
+            return urls
+
+        from PIL import Image, ImageOps
+
+        data = fetch_source(source_url)
+        with Image.open(io.BytesIO(data)) as source:
+            image = ImageOps.exif_transpose(source).convert("RGB")
+        for variant, size in VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail(size)
+            path = os.path.join(self.root, names[variant])
+            # Write then rename, so a half-written file is never served
+            resized.save(path + ".tmp", "WEBP", quality=80)
+            os.replace(path + ".tmp", path)
+        return urls
+
+
+class CloudinaryImageBackend:
+    # Cloudinary resizes on first request, so a variant is just a fetch URL
+
+    def render(self, source_url: str) -> dict:
+        from cloudinary.utils import cloudinary_url
+
+        return {
+            variant: cloudinary_url(
+                source_url, type="fetch", width=width, height=height,
+                crop="limit", quality="auto", fetch_format="auto"
+            )[0]
+            for variant, (width, height) in VARIANT_SIZES.items()
+        }
+
+
+class ImagePipeline:
+    # Rendered results are written (and announced) in batches: one transaction,
+    # one response cache bump and one event per batch, so a sweep or a large
+    # import does not keep the listing cache invalidated for its whole run
+
+    def __init__(self, backend, workers: int = image_workers,
+                 batch_size: int = STORE_BATCH_SIZE, batch_seconds: float = STORE_BATCH_SECONDS):
+        self.backend = backend
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self._queue = asyncio.Queue()
+        self._tasks = []
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self.sweep()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(self, listing_id: int, images):
+        self._queue.put_nowait((listing_id, list(images)))
+
+    async def sweep(self):
+        # Picks up listings whose variants were never built (new column,
+        # restart with jobs still queued, bulk imports). Only the worker holding
+        # the advisory lock sweeps, and it keeps the lock until the last page has
+        # drained, so workers started meanwhile do not queue the same rows.
+        # After a bulk import that can take hours, so the lock is held on a
+        # connection of its own rather than one of the pool's.
+        import asyncpg
+
+        lock_conn = None
+        try:
+            # asyncpg takes a plain postgresql:// DSN
+            lock_conn = await asyncpg.connect(
+                make_url(db_URI).set(drivername="postgresql").render_as_string(hide_password=False)
+            )
+            if not await lock_conn.fetchval("SELECT pg_try_advisory_lock($1)", SWEEP_LOCK_KEY):
+                return
+            last_id = 0
+            while True:
+                async with AsyncSessionLocal() as db:
+                    result = await db.execute(
+                        select(ListingModel.id, ListingModel.images)
+                        .where(ListingModel.id > last_id,
+                               func.jsonb_array_length(ListingModel.image_variants) != func.cardinality(ListingModel.images))
+                        .order_by(ListingModel.id)
+                        .limit(SWEEP_PAGE_SIZE)
+                    )
+                    rows = result.all()
+                if not rows:
+                    break
+                for listing_id, images in rows:
+                    self.enqueue(listing_id, images)
+                last_id = rows[-1][0]
+                await self._queue.join()
+        except Exception:
+            logger.exception("Image variant sweep failed")
+        finally:
+            # Closing the session releases the advisory lock
+            if lock_conn is not None:
+                await lock_conn.close()
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+        finished = []
+        started = loop.time()
+        while True:
+            # Flush when the queue runs dry, the batch is full or it has waited long enough
+            if finished and (self._queue.empty() or len(finished) >= self.batch_size
+                             or loop.time() - started >= self.batch_seconds):
+                try:
+                    await self.store(finished)
+                except Exception:
+                    logger.exception("Image variants not stored", extra={"listings": len(finished)})
+                finally:
+                    for _ in finished:
+                        self._queue.task_done()
+                    finished = []
+
+            listing_id, images = await self._queue.get()
+            if not finished:
+                started = loop.time()
+            try:
+                finished.append((listing_id, images, await self.render(listing_id, images)))
+            except Exception:
+                logger.exception("Image variants failed", extra={"listing_id": listing_id})
+                self._queue.task_done()
+
+    async def render(self, listing_id: int, images) -> list:
+        variants = []
+        for source_url in images:
+            try:
+                variants.append(await asyncio.to_thread(self.backend.render, source_url))
+            except Exception:
+                # Fall back to the original so the list stays aligned with images
+                logger.warning("Image variant render failed", extra={"listing_id": listing_id, "url": source_url})
+                variants.append({variant: source_url for variant in VARIANT_SIZES})
+        return variants
+
+    async def store(self, finished):
+        # `finished` holds (listing_id, images, variants) tuples
+        updated = []
+        async with AsyncSessionLocal() as db:
+            for listing_id, images, variants in finished:
+                # Only if the images are unchanged; an edit in the meantime queued its own job
+                result = await db.execute(
+                    update(ListingModel)
+                    .where(ListingModel.id == listing_id, ListingModel.images == images)
+                    .values(image_variants=variants)
+                )
+                if result.rowcount:
+                    updated.append(listing_id)
+            await db.commit()
+
+        if updated:
+            response_cache.bump()
+            await publish_event("listings", "listing.images_ready", ids=updated)
+
+
+image_pipeline = ImagePipeline(CloudinaryImageBackend() if image_backend == "cloudinary" else LocalImageBackend())
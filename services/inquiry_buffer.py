@@ -0,0 +1,361 @@
+# services/inquiry_buffer.py
+#
+# Write buffer for inquiry submissions. Requests enqueue validated rows and a
+# background flusher inserts them every `flush_ms` or `flush_rows`, whichever
+# comes first, in one transaction.
+#
+# "batched" requests wait for their batch to commit, so an acknowledged
+# inquiry is already in the database. "buffered" requests are answered 202
+# once the row is fsynced to a local journal; journals left by a crashed
+# worker are replayed on startup (ingest_id is unique, so replays are safe).
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, DataError
+from database import async_engine
+from models.inquiry import InquiryModel
+from services.events import publish_event
+from config.environment import inquiry_write_mode, inquiry_flush_ms, inquiry_flush_rows, inquiry_journal_dir
+
+# How long shutdown waits for the queue to drain; anything journaled is replayed on the next start
+DRAIN_TIMEOUT_SECONDS = 30
+# Pause between journal replay attempts while the database is unreachable
+REPLAY_RETRY_SECONDS = 5
+
+logger = logging.getLogger(__name__)
+
+INQUIRY_TABLE = InquiryModel.__table__
+
+
+class InquiryRejected(Exception):
+    # The database refused the row (e.g. the listing does not exist)
+    pass
+
+
+class InquiryBufferUnavailable(Exception):
+    # The batch could not be written at all (e.g. the database is down)
+    pass
+
+
+def _try_lock(fd: int) -> bool:
+    # Non-blocking exclusive lock, released by the OS when the process dies
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+class InquiryJournal:
+    # Append-only segment files of accepted, not yet inserted inquiries. Each
+    # worker writes to its own locked directory; a directory whose lock can
+    # be taken belongs to a dead worker and is replayed.
+
+    def __init__(self, root: str = inquiry_journal_dir):
+        self.root = root
+        self.directory = None
+        self._lock_fd = None
+        self._fd = None
+        self._segment = 0
+        # Entries per segment not yet inserted; sealed segments are deleted at zero
+        self._pending = {}
+        self._written = 0
+        self._synced = 0
+        self._sync_lock = asyncio.Lock()
+
+    def open(self):
+        # The directory is created and locked under a temporary name, then renamed;
+        # orphans() only looks at worker-* names, so it never sees it unlocked
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=".staging-", dir=self.root)
+        self._lock_fd = os.open(os.path.join(staging, "lock"), os.O_CREAT | os.O_RDWR)
+        if not _try_lock(self._lock_fd):
+            os.close(self._lock_fd)
+            raise RuntimeError(f"Could not lock inquiry journal directory {staging}")
+        self.directory = os.path.join(self.root, f"worker-{uuid.uuid4().hex[:12]}")
+        os.rename(staging, self.directory)
+        self._open_segment()
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{segment:08d}.ndjson")
+
+    def _open_segment(self):
+        self._segment += 1
+        self._pending[self._segment] = 0
+        self._fd = os.open(self._segment_path(self._segment), os.O_CREAT | os.O_WRONLY | os.O_APPEND, 0o600)
+
+    def orphans(self):
+        # Yields (directory, lock fd, entries) for journals of workers that are gone
+        for name in sorted(os.listdir(self.root)):
+            directory = os.path.join(self.root, name)
+            if not name.startswith("worker-") or directory == self.directory:
+                continue
+            # No O_CREAT: another worker may be replaying and removing this directory
+            try:
+                lock_fd = os.open(os.path.join(directory, "lock"), os.O_RDWR)
+            except FileNotFoundError:
+                continue
+            if not _try_lock(lock_fd):
+                os.close(lock_fd)
+                continue
+            try:
+                segments = sorted(f for f in os.listdir(directory) if f.endswith(".ndjson"))
+            except FileNotFoundError:
+                # Removed by the worker that held the lock before us
+                os.close(lock_fd)
+                continue
+            entries = []
+            for segment in segments:
+                with open(os.path.join(directory, segment)) as f:
+                    for line in f:
+                        try:
+                            entries.append(json.loads(line))
+                        except ValueError:
+                            # Torn final write; that request was never acknowledged
+                            pass
+            yield directory, lock_fd, entries
+
+    @staticmethod
+    def remove(directory: str, lock_fd: int):
+        for name in os.listdir(directory):
+            os.unlink(os.path.join(directory, name))
+        os.rmdir(directory)
+        os.close(lock_fd)
+
+    def append(self, values: dict) -> int:
+        os.write(self._fd, (json.dumps(values) + "\n").encode())
+        self._written += 1
+        self._pending[self._segment] += 1
+        return self._segment
+
+    async def sync(self):
+        # Group fsync: one fsync covers every append made before it started,
+        # so concurrent requests share the cost
+        target = self._written
+        async with self._sync_lock:
+            if self._synced >= target:
+                return
+            written = self._written
+            await asyncio.to_thread(os.fsync, self._fd)
+            self._synced = written
+
+    async def rotate(self):
+        # Start a new segment so finished ones can be deleted
+        if not self._pending.get(self._segment):
+            return
+        async with self._sync_lock:
+            old_fd, written = self._fd, self._written
+            self._open_segment()
+            await asyncio.to_thread(os.fsync, old_fd)
+            os.close(old_fd)
+            self._synced = max(self._synced, written)
+        self._release_sealed()
+
+    def done(self, segment: int, count: int = 1):
+        self._pending[segment] -= count
+        self._release_sealed()
+
+    def _release_sealed(self):
+        for segment, pending in list(self._pending.items()):
+            if segment != self._segment and pending == 0:
+                os.unlink(self._segment_path(segment))
+                del self._pending[segment]
+
+    def close(self):
+        if self._fd is None:
+            return
+        os.close(self._fd)
+        self._fd = None
+        if not any(self._pending.values()):
+            self.remove(self.directory, self._lock_fd)
+        else:
+            # Left for the next start to replay
+            os.close(self._lock_fd)
+
+
+@dataclass
+class _Pending:
+    values: dict
+    future: Optional[asyncio.Future]
+    segment: Optional[int]
+
+
+class InquiryBuffer:
+
+    def __init__(self, flush_ms: int = inquiry_flush_ms, flush_rows: int = inquiry_flush_rows,
+                 journal: Optional[InquiryJournal] = None):
+        self.flush_seconds = flush_ms / 1000
+        self.flush_rows = flush_rows
+        self.journal = journal
+        self._queue = asyncio.Queue()
+        self._task = None
+        self._replay_task = None
+
+    async def start(self):
+        if self.journal:
+            self.journal.open()
+            # In the background, so a worker can start while the database is down
+            self._replay_task = asyncio.create_task(self._replay_orphans())
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # Drain: everything already accepted is inserted before shutdown
+        if self._replay_task is not None:
+            self._replay_task.cancel()
+            await asyncio.gather(self._replay_task, return_exceptions=True)
+            self._replay_task = None
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), DRAIN_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.error("Inquiry buffer did not drain", extra={"queued": self._queue.qsize()})
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self.journal:
+            self.journal.close()
+
+    async def submit(self, values: dict):
+        # Waits for the row's batch to commit and returns it as a mapping
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Pending(values, future, None))
+        return await future
+
+    async def submit_buffered(self, values: dict) -> str:
+        # Returns a provisional id once the row is durable in the journal
+        values = {**values, "ingest_id": uuid.uuid4().hex}
+        segment = self.journal.append(values)
+        await self.journal.sync()
+        self._queue.put_nowait(_Pending(values, None, segment))
+        return values["ingest_id"]
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_seconds
+            while len(batch) < self.flush_rows:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            except Exception:
+                # Database unavailable: waiting requests get an error; journaled
+                # rows are retried shortly (and stay on disk until inserted)
+                logger.exception("Inquiry flush failed", extra={"rows": len(batch)})
+                retry = []
+                for item in batch:
+                    if item.future:
+                        if not item.future.done():
+                            item.future.set_exception(InquiryBufferUnavailable("Could not save inquiry"))
+                    else:
+                        retry.append(item)
+                if retry:
+                    asyncio.get_running_loop().call_later(1, self._requeue, retry)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _requeue(self, items):
+        for item in items:
+            self._queue.put_nowait(item)
+
+    async def _flush(self, batch):
+        if self.journal:
+            await self.journal.rotate()
+        results = await self._insert([item.values for item in batch])
+
+        for item, row in zip(batch, results):
+            if item.future:
+                # A caller that went away (disconnect, timeout) has nothing to
+                # receive; its row is committed regardless
+                if item.future.done():
+                    pass
+                elif isinstance(row, Exception):
+                    item.future.set_exception(row)
+                else:
+                    item.future.set_result(row)
+            elif isinstance(row, Exception):
+                logger.error("Buffered inquiry dropped", extra={"ingest_id": item.values["ingest_id"], "error": str(row)})
+            if item.segment is not None:
+                self.journal.done(item.segment)
+
+        for row in results:
+            if not isinstance(row, Exception):
+                await publish_event("inquiries", "inquiry.created", id=row["id"], listing_id=row["listing_id"])
+        logger.info("Inquiries flushed", extra={"rows": len(batch)})
+
+    async def _insert(self, rows, replay: bool = False) -> list:
+        # One row mapping, or InquiryRejected, per input row in input order
+        # (replays skip rows already inserted, so their results do not line up)
+        if replay:
+            statement = pg_insert(INQUIRY_TABLE).on_conflict_do_nothing(index_elements=["ingest_id"])
+        else:
+            statement = insert(INQUIRY_TABLE)
+        statement = statement.returning(*INQUIRY_TABLE.c, sort_by_parameter_order=not replay)
+        try:
+            async with async_engine.begin() as conn:
+                result = await conn.execute(statement, rows)
+                return [dict(row._mapping) for row in result]
+        except (IntegrityError, DataError) as e:
+            if len(rows) == 1:
+                return [InquiryRejected(str(e.orig))]
+        # One bad row (e.g. a deleted listing) must not sink the batch; retry individually
+        results = []
+        for values in rows:
+            results.extend(await self._insert([values], replay))
+        return results
+
+    async def _replay_orphans(self):
+        # The orphans' locks are held until each is replayed, so no other worker
+        # replays them too; a failed attempt is retried (ingest_id makes that safe)
+        orphans = list(self.journal.orphans())
+        try:
+            while orphans:
+                directory, lock_fd, entries = orphans[0]
+                try:
+                    for start in range(0, len(entries), self.flush_rows):
+                        await self._insert(entries[start:start + self.flush_rows], replay=True)
+                except Exception:
+                    logger.exception("Inquiry journal replay failed, retrying", extra={"directory": directory})
+                    await asyncio.sleep(REPLAY_RETRY_SECONDS)
+                    continue
+                self.journal.remove(directory, lock_fd)
+                orphans.pop(0)
+                logger.info("Replayed inquiry journal", extra={"directory": directory, "rows": len(entries)})
+        finally:
+            # Cancelled at shutdown: release what was not replayed for the next start
+            for _, lock_fd, _ in orphans:
+                os.close(lock_fd)
+
+
+inquiry_buffer = InquiryBuffer(journal=InquiryJournal() if inquiry_write_mode == "buffered" else None)
@@ -0,0 +1,126 @@
+# services/listing_facets.py
+#
+# Facet counts for the catalog filter sidebar. Unfiltered counts come from
+# the listing_facet_counts summary table, which listing writes adjust by
+# +1/-1 inside their own transaction; filtered counts are aggregated from
+# listings in a single GROUPING SETS scan.
+
+from collections import Counter
+from sqlalchemy import select, delete, func, case, text
+from sqlalchemy.dialects.postgresql import insert
+from models.listing import ListingModel
+from models.listing_facet import ListingFacetCountModel
+
+FACETS = ("make", "spec", "status", "model_year", "price")
+FACET_COLUMNS = [ListingModel.make, ListingModel.spec, ListingModel.status, ListingModel.model_year]
+
+# (upper bound, label); the last bucket is open-ended
+PRICE_BUCKETS = [
+    (10000, "0-10000"),
+    (25000, "10000-25000"),
+    (50000, "25000-50000"),
+    (100000, "50000-100000"),
+    (250000, "100000-250000"),
+    (500000, "250000-500000"),
+    (None, "500000+"),
+]
+PRICE_BUCKET_ORDER = [label for _, label in PRICE_BUCKETS]
+
+
+def price_bucket(price) -> str:
+    for upper, label in PRICE_BUCKETS:
+        if upper is None or price < upper:
+            return label
+
+
+def _price_bucket_sql():
+    return case(
+        *[(ListingModel.price < upper, label) for upper, label in PRICE_BUCKETS if upper is not None],
+        else_=PRICE_BUCKETS[-1][1]
+    )
+
+
+def facet_values(listing) -> list:
+    # (facet, value) pairs a listing counts towards; takes a model or a dict
+    get = listing.get if isinstance(listing, dict) else lambda name: getattr(listing, name, None)
+    pairs = [(facet, get(facet)) for facet in ("make", "spec", "status", "model_year")]
+    if get("price") is not None:
+        pairs.append(("price", price_bucket(get("price"))))
+    return [(facet, str(value)) for facet, value in pairs if value is not None]
+
+
+async def adjust_facets(db, added=(), removed=()):
+    # Call before the write's commit so the counts change atomically with it
+    deltas = Counter()
+    for values in added:
+        deltas.update(values)
+    for values in removed:
+        deltas.subtract(values)
+    # Sorted so concurrent writers lock the counter rows in the same order
+    rows = [{"facet": f, "value": v, "count": n} for (f, v), n in sorted(deltas.items()) if n]
+    if not rows:
+        return
+    statement = insert(ListingFacetCountModel).values(rows)
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=["facet", "value"],
+        set_={"count": ListingFacetCountModel.count + statement.excluded.count}
+    ))
+
+
+def _grouped_counts_query(filtered_query):
+    # GROUPING SETS ((make), (spec), ...): every facet from one scan; grouping(col) = 0
+    # marks the rows grouped by that column
+    base = filtered_query.add_columns(_price_bucket_sql().label("price")).subquery()
+    columns = [base.c[facet] for facet in FACETS]
+    return select(
+        *columns,
+        *[func.grouping(column).label(f"g_{column.name}") for column in columns],
+        func.count().label("count"),
+    ).group_by(func.grouping_sets(*columns))
+
+
+async def _aggregate(db, filtered_query) -> list:
+    result = await db.execute(_grouped_counts_query(filtered_query))
+    counts = []
+    for row in result:
+        mapping = row._mapping
+        for facet in FACETS:
+            if mapping[f"g_{facet}"] == 0 and mapping[facet] is not None:
+                counts.append((facet, str(mapping[facet]), mapping["count"]))
+    return counts
+
+
+async def facet_counts(db, filtered_query=None) -> dict:
+    if filtered_query is None:
+        result = await db.execute(
+            select(ListingFacetCountModel.facet, ListingFacetCountModel.value, ListingFacetCountModel.count)
+            .where(ListingFacetCountModel.count > 0)
+        )
+        counts = result.all()
+    else:
+        counts = await _aggregate(db, filtered_query)
+
+    facets = {facet: [] for facet in FACETS}
+    for facet, value, count in counts:
+        facets[facet].append({"value": value, "count": count})
+    for facet, items in facets.items():
+        if facet == "price":
+            items.sort(key=lambda item: PRICE_BUCKET_ORDER.index(item["value"]))
+        elif facet == "model_year":
+            items.sort(key=lambda item: item["value"], reverse=True)
+        else:
+            items.sort(key=lambda item: (-item["count"], item["value"]))
+    return facets
+
+
+async def rebuild_facets(db):
+    # Recounts from scratch, for rows written outside the API (seeding, COPY).
+    # The lock waits for in-flight listing writes and holds off new ones until
+    # commit, so none is counted twice or missed.
+    await db.execute(text("LOCK TABLE listing_facet_counts IN EXCLUSIVE MODE"))
+    counts = await _aggregate(db, select(*FACET_COLUMNS))
+    await db.execute(delete(ListingFacetCountModel))
+    if counts:
+        await db.execute(insert(ListingFacetCountModel).values(
+            [{"facet": facet, "value": value, "count": count} for facet, value, count in counts]
+        ))
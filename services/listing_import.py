@@ -0,0 +1,238 @@
+# services/listing_import.py
+#
+# Streams a CSV or NDJSON upload into the listings table: rows are parsed as
+# the body arrives, validated with ListingCreate, and inserted in batches, so
+# memory stays flat however large the file is.
+
+import codecs
+import csv
+import json
+import logging
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.listing import ListingModel
+from services.image_pipeline import image_pipeline
+from services.listing_facets import facet_values, adjust_facets
+from serializers.listing import ListingCreate
+from config.environment import import_batch_size, import_max_reported_errors, import_max_record_bytes
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+
+
+class ImportAborted(Exception):
+    # The rest of the body cannot be split into records (e.g. an unbalanced quote)
+    pass
+
+
+class ImportReport:
+    # Counts every row but keeps only the first `max_errors` error details
+
+    def __init__(self, max_errors: int = import_max_reported_errors):
+        self.max_errors = max_errors
+        self.rows = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+        self.aborted = False
+
+    def fail(self, row: int, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "errors": errors})
+
+    def abort(self, row: int, message: str):
+        # Always reported, even past `max_errors`: it is why the import stopped
+        self.aborted = True
+        self.errors.append({"row": row, "errors": [{"msg": message}]})
+
+    def as_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "aborted": self.aborted,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def _lines(chunks, max_length: int = import_max_record_bytes):
+    # Decodes the byte stream incrementally and yields complete lines, line endings
+    # included (csv.reader needs them inside quoted fields)
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+        if len(pending) > max_length:
+            raise ImportAborted(f"Line longer than {max_length} characters")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+class _RecordContinues(Exception):
+    pass
+
+
+def _parse_csv_lines(lines: list) -> list:
+    # Raises _RecordContinues when csv.reader wants another line to finish the record
+    def feed():
+        yield from lines
+        raise _RecordContinues
+
+    return next(csv.reader(feed()))
+
+
+async def _csv_records(chunks, max_length: int = import_max_record_bytes):
+    # Yields each record's fields, or the csv.Error it raised. A quoted field may
+    # span lines, so lines are collected until csv.reader completes the record;
+    # the size cap stops an unbalanced quote from swallowing the rest of the file.
+    lines = []
+    size = 0
+    async for line in _lines(chunks, max_length):
+        lines.append(line)
+        size += len(line)
+        try:
+            yield _parse_csv_lines(lines)
+        except _RecordContinues:
+            if size > max_length:
+                raise ImportAborted(f"Record longer than {max_length} characters; check for an unbalanced quote")
+            continue
+        except csv.Error as e:
+            yield e
+        lines, size = [], 0
+    if lines:
+        yield csv.Error("Input ended inside a quoted field")
+
+
+def _csv_row_to_listing(row: dict) -> dict:
+    # CSV has no nulls or lists: blanks become missing, images is a JSON array or "|"-separated
+    data = {key: value for key, value in row.items() if key and value != ""}
+    images = data.get("images")
+    if images is not None:
+        data["images"] = json.loads(images) if images.lstrip().startswith("[") else images.split("|")
+    return data
+
+
+def _record_parser(fmt: str):
+    if fmt == "ndjson":
+        return json.loads
+
+    header = []
+
+    def parse_csv(fields):
+        if isinstance(fields, csv.Error):
+            raise fields
+        if not header:
+            header.extend(name.strip() for name in fields)
+            return None
+        return _csv_row_to_listing(dict(zip(header, fields)))
+
+    return parse_csv
+
+
+# RETURNING gives the new ids so their image variants can be queued
+INSERT_LISTINGS = insert(ListingModel).returning(ListingModel.id, ListingModel.images)
+
+
+def _queue_image_variants(rows):
+    for listing_id, images in rows:
+        if images:
+            image_pipeline.enqueue(listing_id, images)
+
+
+async def _insert_batch(db: AsyncSession, batch, report: ImportReport):
+    try:
+        result = await db.execute(INSERT_LISTINGS, [values for _, values in batch])
+        rows = result.all()
+        await adjust_facets(db, added=[facet_values(values) for _, values in batch])
+        await db.commit()
+        report.inserted += len(batch)
+        _queue_image_variants(rows)
+    except DBAPIError:
+        # Retry one at a time so a single bad row does not sink the whole batch
+        await db.rollback()
+        for row_number, values in batch:
+            try:
+                result = await db.execute(INSERT_LISTINGS, [values])
+                rows = result.all()
+                await adjust_facets(db, added=[facet_values(values)])
+                await db.commit()
+                report.inserted += 1
+                _queue_image_variants(rows)
+            except DBAPIError as e:
+                await db.rollback()
+                report.fail(row_number, [{"msg": str(e.orig)}])
+
+
+def _is_blank(record) -> bool:
+    # NDJSON records are lines; CSV records are already split into fields
+    if isinstance(record, str):
+        return not record.strip()
+    return isinstance(record, list) and not any(field.strip() for field in record)
+
+
+async def import_listings(chunks, fmt: str, db: AsyncSession, owner_id: int,
+                          batch_size: int = import_batch_size) -> ImportReport:
+    report = ImportReport()
+    # Both formats are read as one record per line (CSV records may span quoted newlines);
+    # row numbers count every record, so CSV data starts at row 2 like in a spreadsheet
+    records = _csv_records(chunks) if fmt == "csv" else _lines(chunks)
+    parse = _record_parser(fmt)
+    batch = []
+    row_number = 0
+
+    try:
+        async for raw in records:
+            row_number += 1
+            if _is_blank(raw):
+                continue
+
+            try:
+                record = parse(raw)
+            except (ValueError, csv.Error) as e:
+                report.rows += 1
+                report.fail(row_number, [{"msg": f"Unparseable row: {e}"}])
+                continue
+            if record is None:
+                # CSV header
+                continue
+            report.rows += 1
+
+            if not isinstance(record, dict):
+                report.fail(row_number, [{"msg": "Row must be an object"}])
+                continue
+            try:
+                listing = ListingCreate.model_validate(record)
+            except ValidationError as e:
+                report.fail(row_number, e.errors(include_url=False, include_context=False))
+                continue
+
+            values = listing.model_dump()
+            values["images"] = values["images"] or []
+            values["owner_id"] = owner_id
+            batch.append((row_number, values))
+            if len(batch) >= batch_size:
+                await _insert_batch(db, batch, report)
+                batch = []
+    except ImportAborted as e:
+        report.abort(row_number + 1, str(e))
+
+    if batch:
+        await _insert_batch(db, batch, report)
+
+    logger.info("Listing import finished", extra={
+        "format": fmt,
+        "rows": report.rows,
+        "inserted": report.inserted,
+        "failed": report.failed,
+        "aborted": report.aborted,
+    })
+    return report
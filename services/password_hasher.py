@@ -0,0 +1,78 @@
+# services/password_hasher.py
+
+import asyncio
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fastapi import HTTPException, status
+from utils.passwords import hash_password, verify_and_update, load_backend
+from config.environment import hash_workers, hash_queue_size
+
+
+# Runs in the worker process; reports how long the hash itself took
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasher:
+    # Runs bcrypt in a dedicated process pool so a burst of logins cannot
+    # occupy the threadpool that serves every other sync endpoint. At most
+    # `max_pending` jobs may be running or queued; beyond that callers get
+    # a 503 with a Retry-After estimate instead of waiting.
+
+    def __init__(self, workers: int = hash_workers, max_pending: int = hash_queue_size):
+        self.workers = max(workers, 1)
+        self.max_pending = max_pending
+        self._executor = None
+        self._pending = 0
+        self._avg_seconds = 0.25  # Running average of one hash, used for Retry-After
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _retry_after(self) -> int:
+        return max(math.ceil(self._pending * self._avg_seconds / self.workers), 1)
+
+    async def _submit(self, fn, *args):
+        # _pending is only touched from the event loop thread, so no lock is needed
+        if self._pending >= self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": str(self._retry_after())}
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(self._get_executor(), _timed, fn, *args)
+        finally:
+            self._pending -= 1
+
+        self._avg_seconds = 0.9 * self._avg_seconds + 0.1 * elapsed
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password)
+
+    # Returns (matches, new_hash); new_hash is set when the bcrypt cost changed
+    async def verify(self, password: str, password_hash: str):
+        return await self._submit(verify_and_update, password, password_hash)
+
+    # Starts the worker processes and loads bcrypt in each before the first login
+    async def warm(self):
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(loop.run_in_executor(executor, load_backend) for _ in range(self.workers)))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
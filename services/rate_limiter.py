@@ -0,0 +1,146 @@
+# services/rate_limiter.py
+#
+# Token buckets for middleware/rate_limit.py. Each bucket holds up to
+# `capacity` tokens and refills at `capacity / seconds` per second; a request
+# takes one token or is rejected with the time until the next one.
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from config.environment import (
+    rate_limit_backend, redis_url,
+    rate_limit_login_ip, rate_limit_register_ip, rate_limit_inquiry_ip, rate_limit_inquiry_user,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Limit:
+    name: str
+    scope: str  # "ip" or "user"
+    capacity: int
+    seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.seconds
+
+
+def parse_limit(name: str, scope: str, spec: str):
+    # "10/60" -> 10 requests per 60 seconds; "off" -> no limit
+    if spec.strip().lower() in ("", "off", "none"):
+        return None
+    count, seconds = spec.split("/")
+    return Limit(name, scope, int(count), float(seconds))
+
+
+# (method, path without trailing slash) -> limits checked in order
+RULES = {
+    ("POST", "/login"): [parse_limit("login", "ip", rate_limit_login_ip)],
+    ("POST", "/register"): [parse_limit("register", "ip", rate_limit_register_ip)],
+    ("POST", "/api/inquiries"): [
+        parse_limit("inquiry", "ip", rate_limit_inquiry_ip),
+        parse_limit("inquiry", "user", rate_limit_inquiry_user),
+    ],
+}
+RULES = {route: [limit for limit in limits if limit] for route, limits in RULES.items()}
+
+
+class MemoryBucketStore:
+    # Buckets for this worker only; the least recently used are dropped past
+    # `max_keys`, so a flood of distinct IPs cannot grow memory without bound
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    async def take(self, key: str, limit: Limit):
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - updated) * limit.refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        retry_after = 0 if allowed else (1 - tokens) / limit.refill_per_second
+        return allowed, retry_after
+
+
+# Refill and take in one round trip; atomic because Redis runs scripts serially
+_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisBucketStore:
+    # Shared by every worker; keys expire once their bucket would be full again.
+    # While Redis is unreachable this worker falls back to its own buckets
+    # rather than failing the limited routes.
+
+    def __init__(self, url: str = redis_url):
+        import redis.asyncio as redis
+
+        self._errors = redis.RedisError
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(_TAKE_SCRIPT)
+        self._fallback = MemoryBucketStore()
+        self._failing = False
+
+    async def take(self, key: str, limit: Limit):
+        try:
+            allowed, tokens = await self._take(
+                keys=[f"ratelimit:{key}"], args=[limit.capacity, limit.refill_per_second, time.time()]
+            )
+        except self._errors as e:
+            if not self._failing:
+                logger.warning("Redis unavailable, rate limiting per worker", extra={"error": str(e)})
+                self._failing = True
+            return await self._fallback.take(key, limit)
+        if self._failing:
+            logger.info("Redis available again, rate limiting shared")
+            self._failing = False
+        tokens = float(tokens)
+        return bool(allowed), 0 if allowed else (1 - tokens) / limit.refill_per_second
+
+
+class RateLimiter:
+
+    def __init__(self, store, rules: dict = RULES):
+        self.store = store
+        self.rules = rules
+
+    def limits_for(self, method: str, path: str):
+        return self.rules.get((method, path.rstrip("/") or "/"), [])
+
+    # Returns None when allowed, else whole seconds to wait (for Retry-After)
+    async def check(self, limits, ip: str, user_id):
+        for limit in limits:
+            subject = ip if limit.scope == "ip" else user_id
+            if subject is None:
+                continue
+            allowed, retry_after = await self.store.take(f"{limit.name}:{limit.scope}:{subject}", limit)
+            if not allowed:
+                return max(1, math.ceil(retry_after))
+        return None
+
+
+rate_limiter = RateLimiter(RedisBucketStore() if rate_limit_backend == "redis" else MemoryBucketStore())
@@ -0,0 +1,106 @@
+# services/request_metrics.py
+
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from sqlalchemy import event
+from utils.metrics import Histogram, prometheus_histogram_lines, prometheus_sample
+
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+SIZE_BUCKETS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304]
+QUERY_COUNT_BUCKETS = [0, 1, 2, 3, 5, 10, 20, 50, 100]
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Stats for the request being handled. The object is mutable so updates made
+# in threadpool threads or SQLAlchemy's greenlets (which copy the context) are seen.
+query_stats_var: ContextVar = ContextVar("query_stats", default=None)
+
+
+# A connection runs one statement at a time, so a single slot per connection is enough
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = query_stats_var.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - conn.info.pop("query_started", time.perf_counter())
+
+
+def instrument_engine(engine):
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.in_flight = 0
+        self.requests = defaultdict(int)  # (method, route, status) -> count
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.response_size = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+        self.db_queries = defaultdict(lambda: Histogram(QUERY_COUNT_BUCKETS))
+        self.db_seconds = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self._lock = threading.Lock()
+
+    def record(self, method: str, route: str, status: int, seconds: float, size: int, stats: QueryStats):
+        key = (method, route)
+        with self._lock:
+            self.requests[(method, route, status)] += 1
+            latency = self.latency[key]
+            response_size = self.response_size[key]
+            db_queries = self.db_queries[key]
+            db_seconds = self.db_seconds[key]
+        latency.observe(seconds)
+        response_size.observe(size)
+        db_queries.observe(stats.count)
+        db_seconds.observe(stats.seconds)
+
+    def render_prometheus(self, extra_lines=()) -> str:
+        with self._lock:
+            requests = dict(self.requests)
+            series = {
+                "http_request_duration_seconds": dict(self.latency),
+                "http_response_size_bytes": dict(self.response_size),
+                "http_request_db_queries": dict(self.db_queries),
+                "http_request_db_seconds": dict(self.db_seconds),
+            }
+
+        lines = [
+            "# TYPE http_requests_in_flight gauge",
+            prometheus_sample("http_requests_in_flight", {}, self.in_flight),
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(requests.items()):
+            lines.append(prometheus_sample("http_requests_total", {"method": method, "route": route, "status": status}, count))
+
+        for name, histograms in series.items():
+            lines.append(f"# TYPE {name} histogram")
+            for (method, route), histogram in sorted(histograms.items()):
+                lines.extend(prometheus_histogram_lines(name, {"method": method, "route": route}, histogram))
+
+        # Bucket-interpolated latency percentiles, for dashboards without histogram_quantile()
+        lines.append("# TYPE http_request_duration_quantile_seconds gauge")
+        for (method, route), histogram in sorted(series["http_request_duration_seconds"].items()):
+            for q in (0.5, 0.95, 0.99):
+                lines.append(prometheus_sample(
+                    "http_request_duration_quantile_seconds",
+                    {"method": method, "route": route, "quantile": q},
+                    histogram.quantile(q)
+                ))
+
+        lines.extend(extra_lines)
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,84 @@
+# services/response_cache.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from fastapi import Request, Response, status
+from config.environment import response_cache_size, response_cache_ttl_seconds
+
+
+class ResponseCache:
+    # Bounded LRU of pre-serialized JSON bodies keyed by path and query string.
+    # Every entry remembers the version it was built under; bump() makes all
+    # existing entries stale at once without walking the cache.
+
+    def __init__(self, max_entries: int = response_cache_size, ttl_seconds: int = response_cache_ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(request: Request):
+        return (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            version, stored_at, etag, body = entry
+            if version != self.version or time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return etag, body
+
+    def set(self, key, version: int, etag: str, body: bytes):
+        with self._lock:
+            # Built from data read before a write bumped the version, so do not keep it
+            if version != self.version:
+                return
+            self._entries[key] = (version, time.monotonic(), etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+
+
+response_cache = ResponseCache()
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in [tag.strip() for tag in header.split(",")]
+
+
+# Serve a JSON read from the cache, building and storing it on a miss.
+# `build` is an async callable returning the serialized body as bytes.
+async def cached_json_response(request: Request, build) -> Response:
+    key = response_cache.key_for(request)
+    cached = response_cache.get(key)
+    if cached:
+        etag, body = cached
+    else:
+        version = response_cache.version
+        body = await build()
+        etag = make_etag(body)
+        response_cache.set(key, version, etag, body)
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,134 @@
+# services/search_index.py
+#
+# Pure-Python inverted index over listings, used for /api/listings/search when
+# the database cannot run the tsvector search (not Postgres, or the
+# search_vector column is missing) or when SEARCH_BACKEND=python.
+
+import asyncio
+import math
+import re
+import time
+from collections import defaultdict
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.listing import ListingModel
+from services.response_cache import response_cache
+from config.environment import search_backend
+
+# Same fields the Postgres search_vector column covers
+SEARCH_FIELDS = ["make", "model_year", "spec", "exterior", "interior", "notes"]
+LISTING_COLUMNS = [c.name for c in ListingModel.__table__.columns if c.name != "search_vector"]
+
+_token_pattern = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text) -> list:
+    return _token_pattern.findall(str(text).lower()) if text is not None else []
+
+
+def matches_filters(row: dict, filters: dict) -> bool:
+    # Python mirror of controllers.listings.apply_listing_filters
+    if filters["status"] and row["status"] != filters["status"]:
+        return False
+    if filters["make"] and row["make"] != filters["make"]:
+        return False
+    if filters["spec"] and row["spec"] != filters["spec"]:
+        return False
+    if filters["min_year"] is not None and row["model_year"] < filters["min_year"]:
+        return False
+    if filters["max_year"] is not None and row["model_year"] > filters["max_year"]:
+        return False
+    if filters["min_price"] is not None and row["price"] < filters["min_price"]:
+        return False
+    if filters["max_price"] is not None and row["price"] > filters["max_price"]:
+        return False
+    return True
+
+
+class InvertedIndex:
+
+    def __init__(self, rows=()):
+        self.postings = defaultdict(dict)  # token -> {listing id: term frequency}
+        self.rows = {}
+        for row in rows:
+            self.add(row)
+
+    def add(self, row: dict):
+        self.rows[row["id"]] = row
+        for field in SEARCH_FIELDS:
+            for token in tokenize(row.get(field)):
+                self.postings[token][row["id"]] = self.postings[token].get(row["id"], 0) + 1
+
+    # Returns [(score, row)] best first, ties broken by id descending
+    def search(self, terms: list, match_all: bool = False, filters: dict = None):
+        if not terms:
+            return []
+        doc_count = max(len(self.rows), 1)
+        scores = defaultdict(float)
+        matched = defaultdict(int)
+        for term in set(terms):
+            postings = self.postings.get(term, {})
+            idf = math.log(doc_count / (1 + len(postings))) + 1
+            for listing_id, tf in postings.items():
+                scores[listing_id] += tf * idf
+                matched[listing_id] += 1
+
+        needed = len(set(terms)) if match_all else 1
+        results = [
+            (round(score, 6), self.rows[listing_id])
+            for listing_id, score in scores.items()
+            if matched[listing_id] >= needed
+            and (filters is None or matches_filters(self.rows[listing_id], filters))
+        ]
+        results.sort(key=lambda item: (item[0], item[1]["id"]), reverse=True)
+        return results
+
+
+class ListingSearchIndex:
+    # Rebuilt from the listings table whenever a listing write bumps the
+    # response cache version, or after `ttl_seconds` (writes in other workers)
+
+    def __init__(self, ttl_seconds: int = 30):
+        self.ttl_seconds = ttl_seconds
+        self.index = InvertedIndex()
+        self._built_version = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_stale(self) -> bool:
+        return (self._built_version != response_cache.version
+                or time.monotonic() - self._built_at > self.ttl_seconds)
+
+    async def get(self, db: AsyncSession) -> InvertedIndex:
+        if self._is_stale():
+            async with self._lock:
+                if self._is_stale():
+                    version = response_cache.version
+                    result = await db.execute(
+                        select(*[getattr(ListingModel, c) for c in LISTING_COLUMNS])
+                    )
+                    self.index = InvertedIndex(dict(row._mapping) for row in result)
+                    self._built_version = version
+                    self._built_at = time.monotonic()
+        return self.index
+
+
+listing_search_index = ListingSearchIndex()
+
+
+# "auto" checks once per worker whether the database can run the tsvector search
+_postgres_search_available = {}
+
+
+async def use_postgres_search(db: AsyncSession, backend: str = search_backend) -> bool:
+    if backend != "auto":
+        return backend == "postgres"
+    if db.bind.dialect.name != "postgresql":
+        return False
+    if "available" not in _postgres_search_available:
+        result = await db.execute(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_name = 'listings' AND column_name = 'search_vector'"
+        ))
+        _postgres_search_available["available"] = result.first() is not None
+    return _postgres_search_available["available"]
@@ -0,0 +1,110 @@
+# services/warmup.py
+
+import asyncio
+import inspect
+import logging
+import time
+from pydantic import BaseModel
+from database import async_engine
+from utils.import_timer import import_timer
+from config.environment import warmup_timeout_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    # Runs each worker's warm-up steps at startup and keeps their timings.
+    # `ready` turns true once every step has succeeded; a step that failed
+    # (the database was not up yet, say) is retried on the next /ready probe.
+
+    def __init__(self, timeout_seconds: float = warmup_timeout_seconds):
+        self.timeout_seconds = timeout_seconds
+        self.ready = False
+        self.steps = []
+        self.results = {}
+        self._task = None
+
+    def step(self, name: str, fn):
+        # `fn` takes no arguments and may be sync or async
+        self.steps.append((name, fn))
+
+    async def _run(self):
+        for name, fn in self.steps:
+            if self.results.get(name, {}).get("ok"):
+                continue
+            started = time.perf_counter()
+            try:
+                result = fn()
+                if inspect.isawaitable(result):
+                    await result
+                outcome = {"ok": True}
+            except Exception as e:
+                logger.warning("Warm-up step failed", extra={"step": name, "error": str(e)})
+                outcome = {"ok": False, "error": str(e)}
+            outcome["seconds"] = round(time.perf_counter() - started, 4)
+            self.results[name] = outcome
+
+        self.ready = all(self.results[name]["ok"] for name, _ in self.steps)
+        logger.info("Startup timing", extra={
+            "ready": self.ready,
+            "warmup": self.results,
+            "imports": import_timer.report(),
+        })
+
+    async def run(self):
+        # Past `timeout_seconds` the worker starts serving and the remaining
+        # steps finish in the background, with /ready still answering 503
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            logger.warning("Warm-up still running, serving anyway", extra={"timeout_seconds": self.timeout_seconds})
+
+    def retry(self):
+        if not self.ready and self._task is not None and self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> dict:
+        return {"ready": self.ready, "steps": self.results}
+
+
+warmup = Warmup()
+
+
+async def open_pool_connections(count: int):
+    # Holds `count` connections at once, so the pool really opens that many
+    async def open_one():
+        conn = await async_engine.connect()
+        try:
+            await conn.exec_driver_sql("SELECT 1")
+        except BaseException:
+            await conn.close()
+            raise
+        return conn
+
+    results = await asyncio.gather(*(open_one() for _ in range(count)), return_exceptions=True)
+    for conn in results:
+        if not isinstance(conn, BaseException):
+            await conn.close()
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        raise errors[0]
+
+
+def prebuild_validators(app):
+    # pydantic compiles a model's validator when the class is defined (that
+    # cost is in the import report); what is left for the first requests is
+    # resolving deferred models and building the OpenAPI schema
+    for route in app.routes:
+        model = getattr(route, "response_model", None)
+        if inspect.isclass(model) and issubclass(model, BaseModel):
+            model.model_rebuild()
+    app.openapi()
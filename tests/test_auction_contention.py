@@ -0,0 +1,31 @@
+# tests/test_auction_contention.py
+#
+# Concurrent bids against one auction must not be lost or applied out of
+# order. Needs a real Postgres (row locks are the point), so it only runs when
+# DB_URI is set; scripts/auction_contention.py does the same at larger scale.
+
+import asyncio
+import os
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("asyncpg")
+
+if not os.environ.get("DB_URI", "").startswith("postgresql"):
+    pytest.skip("DB_URI does not point at a Postgres database", allow_module_level=True)
+
+from database import async_engine
+from scripts.auction_contention import run
+
+
+def test_concurrent_bids_are_neither_lost_nor_reordered():
+    async def scenario():
+        try:
+            return await run(bid_count=500, concurrency=50, bidders=20)
+        finally:
+            await async_engine.dispose()
+
+    summary = asyncio.run(scenario())
+
+    assert summary["accepted"] > 0
+    assert summary["problems"] == []
@@ -0,0 +1,51 @@
+# tests/test_events.py
+#
+# WebSocket event stream against the in-process broker.
+
+import time
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from controllers import events
+from services.events import InProcessBroker
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = InProcessBroker()
+    monkeypatch.setattr(events, "event_broker", broker)
+    return broker
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(events.router)
+    with TestClient(app) as client:
+        yield client
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_websocket_delivers_events(broker, client):
+    with client.websocket_connect("/api/events/ws?topics=listings") as ws:
+        assert _wait_for(lambda: broker.subscriber_count() == 1)
+        client.portal.call(broker.publish, "listings", {"type": "listing.created", "id": 1})
+        assert ws.receive_json() == {"topic": "listings", "type": "listing.created", "id": 1}
+
+
+def test_websocket_unsubscribes_on_disconnect_without_events(broker, client):
+    with client.websocket_connect("/api/events/ws?topics=listings") as ws:
+        assert _wait_for(lambda: broker.subscriber_count() == 1)
+        ws.close()
+        # Nothing is published, so only the receive side can notice the close
+        assert _wait_for(lambda: broker.subscriber_count() == 0)
@@ -0,0 +1,59 @@
+# tests/test_inquiry_buffer.py
+#
+# The batching flusher, with _insert and publish_event replaced so no
+# database is needed.
+
+import asyncio
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from services import inquiry_buffer
+from services.inquiry_buffer import InquiryBuffer
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+
+    async def publish_event(topic, event, **fields):
+        events.append((event, fields))
+
+    monkeypatch.setattr(inquiry_buffer, "publish_event", publish_event)
+    return events
+
+
+def _buffer(rows_inserted):
+    buffer = InquiryBuffer(flush_ms=50, flush_rows=10)
+
+    async def insert(rows, replay=False):
+        # Yield once, like a real round trip, so callers can be cancelled mid-flush
+        await asyncio.sleep(0)
+        results = [{"id": len(rows_inserted) + n + 1, **values} for n, values in enumerate(rows)]
+        rows_inserted.extend(results)
+        return results
+
+    buffer._insert = insert
+    return buffer
+
+
+def test_cancelled_caller_does_not_fail_the_rest_of_its_batch(published):
+    inserted = []
+
+    async def scenario():
+        buffer = _buffer(inserted)
+        await buffer.start()
+        gone = asyncio.create_task(buffer.submit({"listing_id": 1}))
+        waiting = asyncio.create_task(buffer.submit({"listing_id": 2}))
+        await asyncio.sleep(0)
+        gone.cancel()
+        row = await waiting
+        await buffer.stop()
+        return gone, row
+
+    gone, row = asyncio.run(scenario())
+
+    assert gone.cancelled()
+    assert row["listing_id"] == 2
+    assert [r["listing_id"] for r in inserted] == [1, 2]
+    assert [fields["listing_id"] for _, fields in published] == [1, 2]
@@ -0,0 +1,54 @@
+# tests/test_logging_config.py
+#
+# Records go through the same queue handler and listener as setup_logging(),
+# writing to a buffer instead of stdout.
+
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from config.logging_config import JsonFormatter, JsonQueueHandler
+
+
+def _log_through_queue(log):
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, output)
+
+    logger = logging.getLogger("tests.logging_config")
+    logger.propagate = False
+    logger.handlers = [JsonQueueHandler(log_queue)]
+    listener.start()
+    try:
+        log(logger)
+    finally:
+        listener.stop()
+        logger.handlers = []
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_exception_traceback_goes_to_exc_info_field():
+    def log(logger):
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("Division failed for %s", "listing", extra={"listing_id": 3})
+
+    [entry] = _log_through_queue(log)
+
+    assert entry["message"] == "Division failed for listing"
+    assert entry["listing_id"] == 3
+    assert entry["level"] == "ERROR"
+    assert entry["exc_info"].startswith("Traceback")
+    assert "ZeroDivisionError" in entry["exc_info"]
+
+
+def test_plain_record_has_no_exc_info():
+    [entry] = _log_through_queue(lambda logger: logger.warning("Cache cold"))
+
+    assert entry["message"] == "Cache cold"
+    assert "exc_info" not in entry
@@ -0,0 +1,30 @@
+# tests/test_pagination.py
+
+from datetime import datetime, timedelta, timezone
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import HTTPException
+from utils.pagination import encode_cursor, decode_cursor
+
+
+def test_rank_cursor_round_trips_as_float():
+    assert decode_cursor(encode_cursor(0.25, 7), "rank") == (0.25, 7)
+
+
+@pytest.mark.parametrize("value", ["x", None, [1]])
+def test_rank_cursor_rejects_non_numbers(value):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(encode_cursor(value, 1), "rank")
+    assert error.value.status_code == 400
+
+
+def test_created_at_cursor_round_trips():
+    created_at = datetime(2026, 1, 2, 3, 4, 5)
+    assert decode_cursor(encode_cursor(created_at, 3), "created_at") == (created_at, 3)
+
+
+def test_created_at_cursor_with_offset_becomes_naive_utc():
+    created_at = datetime(2026, 1, 2, 5, 4, 5, tzinfo=timezone(timedelta(hours=2)))
+    assert decode_cursor(encode_cursor(created_at, 3), "created_at") == (datetime(2026, 1, 2, 3, 4, 5), 3)
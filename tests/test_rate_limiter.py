@@ -0,0 +1,101 @@
+# tests/test_rate_limiter.py
+#
+# Token buckets on the in-memory store, with a fake clock.
+
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+from services import rate_limiter
+from services.rate_limiter import Limit, MemoryBucketStore, RateLimiter, parse_limit
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=clock, time=clock))
+    return clock
+
+
+def _take(store, key, limit):
+    return asyncio.run(store.take(key, limit))
+
+
+def test_bucket_refills_at_capacity_per_period(clock):
+    store = MemoryBucketStore()
+    limit = Limit("login", "ip", capacity=2, seconds=10)
+
+    assert _take(store, "a", limit)[0]
+    assert _take(store, "a", limit)[0]
+    allowed, retry_after = _take(store, "a", limit)
+    assert not allowed
+    assert retry_after == pytest.approx(5)
+
+    # One token back after seconds / capacity
+    clock.now += 5
+    assert _take(store, "a", limit)[0]
+    assert not _take(store, "a", limit)[0]
+
+    # Never refills past capacity
+    clock.now += 1000
+    assert [_take(store, "a", limit)[0] for _ in range(3)] == [True, True, False]
+
+
+def test_retry_after_rounds_up_to_whole_seconds(clock):
+    limiter = RateLimiter(MemoryBucketStore())
+    limits = [Limit("login", "ip", capacity=3, seconds=10)]
+
+    for _ in range(3):
+        assert asyncio.run(limiter.check(limits, "1.2.3.4", None)) is None
+    # 0.3 tokens a second: 3.33s for the next one
+    assert asyncio.run(limiter.check(limits, "1.2.3.4", None)) == 4
+
+    # Almost refilled still means wait at least a second
+    clock.now += 3.3
+    assert asyncio.run(limiter.check(limits, "1.2.3.4", None)) == 1
+
+
+def test_least_recently_used_keys_are_evicted(clock):
+    store = MemoryBucketStore(max_keys=2)
+    limit = Limit("login", "ip", capacity=1, seconds=60)
+
+    _take(store, "a", limit)
+    _take(store, "b", limit)
+    # Touching "a" makes "b" the oldest
+    assert not _take(store, "a", limit)[0]
+    _take(store, "c", limit)
+
+    assert list(store._buckets) == ["a", "c"]
+    # "b" starts over with a full bucket
+    assert _take(store, "b", limit)[0]
+
+
+def test_scopes_use_separate_keys_and_anonymous_skips_user(clock):
+    store = MemoryBucketStore()
+    limiter = RateLimiter(store)
+    limits = [Limit("inquiry", "ip", capacity=5, seconds=60), Limit("inquiry", "user", capacity=1, seconds=60)]
+
+    assert asyncio.run(limiter.check(limits, "1.2.3.4", None)) is None
+    assert list(store._buckets) == ["inquiry:ip:1.2.3.4"]
+
+    assert asyncio.run(limiter.check(limits, "1.2.3.4", 7)) is None
+    assert "inquiry:user:7" in store._buckets
+    # Same user from another address is still limited
+    assert asyncio.run(limiter.check(limits, "5.6.7.8", 7)) == 60
+
+
+@pytest.mark.parametrize("spec", ["off", "OFF", " none ", ""])
+def test_parse_limit_off(spec):
+    assert parse_limit("login", "ip", spec) is None
+
+
+def test_parse_limit():
+    assert parse_limit("login", "ip", "10/60") == Limit("login", "ip", 10, 60.0)
@@ -0,0 +1,84 @@
+# tests/test_search_index.py
+#
+# The in-memory search fallback and how "auto" picks between it and the
+# Postgres tsvector search. No database needed: the sessions are stand-ins
+# exposing only what use_postgres_search reads.
+
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from services import search_index
+from services.search_index import InvertedIndex, use_postgres_search
+
+NO_FILTERS = {
+    "status": None, "make": None, "spec": None,
+    "min_year": None, "max_year": None, "min_price": None, "max_price": None,
+}
+
+
+def _listing(listing_id, make, model_year, exterior="White", status="Available", price=100000.0):
+    return {
+        "id": listing_id, "make": make, "model_year": model_year, "spec": "GCC",
+        "exterior": exterior, "interior": "Black", "notes": None, "status": status, "price": price,
+    }
+
+
+class _Session:
+    def __init__(self, dialect: str, has_search_vector: bool = False):
+        self.bind = SimpleNamespace(dialect=SimpleNamespace(name=dialect))
+        self.queries = 0
+        self._row = (1,) if has_search_vector else None
+
+    async def execute(self, statement):
+        self.queries += 1
+        return SimpleNamespace(first=lambda: self._row)
+
+
+@pytest.fixture(autouse=True)
+def fresh_capability_cache():
+    search_index._postgres_search_available.clear()
+    yield
+    search_index._postgres_search_available.clear()
+
+
+def test_auto_uses_python_index_on_non_postgres_engine():
+    db = _Session("sqlite")
+    assert asyncio.run(use_postgres_search(db, "auto")) is False
+    assert db.queries == 0
+
+
+def test_auto_uses_python_index_without_search_vector_column():
+    db = _Session("postgresql", has_search_vector=False)
+    assert asyncio.run(use_postgres_search(db, "auto")) is False
+
+
+def test_auto_uses_postgres_when_column_exists_and_checks_once():
+    db = _Session("postgresql", has_search_vector=True)
+    assert asyncio.run(use_postgres_search(db, "auto")) is True
+    assert asyncio.run(use_postgres_search(db, "auto")) is True
+    assert db.queries == 1
+
+
+def test_explicit_backend_wins():
+    assert asyncio.run(use_postgres_search(_Session("sqlite"), "postgres")) is True
+    assert asyncio.run(use_postgres_search(_Session("postgresql", True), "python")) is False
+
+
+def test_python_index_ranks_and_filters():
+    index = InvertedIndex([
+        _listing(1, "Porsche", 2020),
+        _listing(2, "Porsche", 2021, exterior="Porsche Red"),
+        _listing(3, "Ferrari", 2021, status="Sold"),
+    ])
+
+    results = index.search(["porsche"], filters=NO_FILTERS)
+    assert [row["id"] for _, row in results] == [2, 1]
+
+    both = index.search(["porsche", "2020"], match_all=True, filters=NO_FILTERS)
+    assert [row["id"] for _, row in both] == [1]
+
+    available = index.search(["2021"], filters={**NO_FILTERS, "status": "Available"})
+    assert [row["id"] for _, row in available] == [2]
@@ -0,0 +1,110 @@
+# utils/import_timer.py
+#
+# Times module imports during startup. Installed at the top of main.py and
+# removed once the app is built; report() feeds the startup timing log.
+
+import sys
+import threading
+import time
+from importlib.abc import MetaPathFinder
+
+
+class _TimedLoader:
+    # Stands in for a module's loader during its first import only; the
+    # module and its spec get the real loader back before any code runs
+
+    def __init__(self, loader, timer):
+        self._loader = loader
+        self._timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # Extension modules do their initialisation here rather than in exec_module
+        self._timer.enter(spec.name)
+        try:
+            return self._loader.create_module(spec)
+        finally:
+            self._timer.exit()
+
+    def exec_module(self, module):
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._timer.enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.exit()
+
+
+class ImportTimer(MetaPathFinder):
+    # Records each module's own import time (excluding the modules it
+    # imports in turn), so per-package sums add up to the total
+
+    def __init__(self):
+        self.self_seconds = {}
+        self.total_seconds = 0.0
+        self._installed_at = None
+        self._local = threading.local()
+
+    def install(self):
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+            self._installed_at = time.perf_counter()
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+            self.total_seconds += time.perf_counter() - self._installed_at
+
+    def find_spec(self, name, path=None, target=None):
+        # Ask the real finders, then time whatever they found
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def enter(self, name: str):
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        stack = self._stack()
+        name, started, children = stack.pop()
+        elapsed = time.perf_counter() - started
+        self.self_seconds[name] = self.self_seconds.get(name, 0.0) + elapsed - children
+        if stack:
+            stack[-1][2] += elapsed
+
+    def report(self, top: int = 15) -> dict:
+        by_package = {}
+        for name, seconds in self.self_seconds.items():
+            package = name.partition(".")[0]
+            by_package[package] = by_package.get(package, 0.0) + seconds
+
+        def slowest(seconds_by_name):
+            ranked = sorted(seconds_by_name.items(), key=lambda item: item[1], reverse=True)[:top]
+            return {name: round(seconds, 4) for name, seconds in ranked}
+
+        return {
+            "total_seconds": round(self.total_seconds, 4),
+            "modules": len(self.self_seconds),
+            "by_package": slowest(by_package),
+            "slowest_modules": slowest(self.self_seconds),
+        }
+
+
+import_timer = ImportTimer()
@@ -0,0 +1,79 @@
+# utils/metrics.py
+
+import threading
+
+
+class Histogram:
+    # Fixed-bucket histogram; bucket bounds are upper limits, with an implicit +Inf
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        # Cumulative counts, Prometheus style
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets + [float("inf")], counts):
+            running += n
+            cumulative["+Inf" if bound == float("inf") else str(bound)] = running
+        return {"buckets": cumulative, "sum": total, "count": count}
+
+    # Estimate of the q-th quantile (0..1), interpolated inside the matching bucket
+    def quantile(self, q: float) -> float:
+        with self._lock:
+            counts = list(self._counts)
+            count = self._count
+        if count == 0:
+            return 0.0
+        rank = q * count
+        running, lower = 0, 0.0
+        for bound, n in zip(self.buckets, counts):
+            if n and running + n >= rank:
+                return lower + (bound - lower) * (rank - running) / n
+            running += n
+            lower = bound
+        # Falls in +Inf: the largest finite bound is the best we can say
+        return self.buckets[-1] if self.buckets else 0.0
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+# Prometheus text exposition lines for one histogram series
+def prometheus_histogram_lines(name: str, labels: dict, histogram: Histogram) -> list:
+    snap = histogram.snapshot()
+    lines = [
+        f"{name}_bucket{_format_labels({**labels, 'le': le})} {count}"
+        for le, count in snap["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{_format_labels(labels)} {snap['sum']}")
+    lines.append(f"{name}_count{_format_labels(labels)} {snap['count']}")
+    return lines
+
+
+def prometheus_sample(name: str, labels: dict, value) -> str:
+    return f"{name}{_format_labels(labels)} {value}"
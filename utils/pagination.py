@@ -0,0 +1,50 @@
+# utils/pagination.py
+
+import base64
+import json
+from datetime import datetime, timezone
+from fastapi import HTTPException, status
+
+# Sort keys a client may ask for, mapped to (column name, descending?)
+SORT_OPTIONS = {
+    "created_at": ("created_at", False),
+    "-created_at": ("created_at", True),
+    "price": ("price", False),
+    "-price": ("price", True),
+}
+
+
+def encode_cursor(sort_value, row_id: int) -> str:
+    # Datetimes are not JSON serializable, so store them as ISO strings
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, column: str):
+    # Put back the padding we stripped in encode_cursor
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        if column == "created_at" and sort_value is not None:
+            # A hand-made cursor may carry an offset; the column is naive UTC
+            sort_value = naive_utc(datetime.fromisoformat(sort_value))
+        elif column == "price" and sort_value is not None:
+            sort_value = float(sort_value)
+        elif column == "rank":
+            # Search ranks are never null; anything but a number is a bad cursor
+            sort_value = float(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+# created_at columns are naive timestamps; compare aware inputs in UTC
+def naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,32 @@
+# utils/passwords.py
+#
+# Kept free of app imports so password-hashing worker processes stay light.
+
+from passlib.context import CryptContext
+from config.environment import bcrypt_rounds
+
+# Creating a password hashing context using bcrypt.
+# Hashes made with any other cost are flagged for rehash on the next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=bcrypt_rounds,
+    bcrypt__min_rounds=bcrypt_rounds,
+    bcrypt__max_rounds=bcrypt_rounds,
+)
+
+
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+# Loads the bcrypt backend (passlib self-tests it on first use) ahead of the first real hash
+def load_backend() -> str:
+    return pwd_context.handler("bcrypt").get_backend()
+
+
+# Returns (matches, new_hash); new_hash is None unless the stored hash should be replaced
+def verify_and_update(password: str, password_hash: str):
+    if not password_hash:
+        return False, None
+    return pwd_context.verify_and_update(password, password_hash)
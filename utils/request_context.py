@@ -0,0 +1,6 @@
+# utils/request_context.py
+
+from contextvars import ContextVar
+
+# Id of the request being handled, set by middleware.request_id.RequestIdMiddleware
+request_id_var: ContextVar = ContextVar("request_id", default=None)